@@ -1,50 +1,74 @@
-from typing import Any, Dict, List
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
+from app.context_cache import context_cache
 from app.mcp_client import mcp_client, MCPClientError
 from app.memory import memory_store
 from app.schemas import ChatResponse, MemoryState
 from app.planner import query_planner, PlanningError
 
 
+logger = logging.getLogger(__name__)
+
+FORBIDDEN_TEXT = "You do not have permission to perform this operation on the requested data."
+
+SUPPORTED_TOOLS = {
+    "validate_query",
+    "dry_run_query",
+    "run_read_query",
+    "run_write_query",
+    "execute_write_safely",
+    "explain_query",
+    "estimate_query_cost",
+}
+
+
 class AgentError(Exception):
     pass
 
 
+def _is_permission_error(error: MCPClientError) -> bool:
+    msg = str(error).lower()
+
+    return (
+        "permission" in msg
+        or "not allowed" in msg
+        or "forbidden" in msg
+        or "unauthorized" in msg
+    )
+
+
 class OrchestratingAgent:
     async def handle_message(
         self,
         *,
         conversation_key: str,
         user_message: str,
-        jwt_token: str
+        jwt_token: str,
+        timings: Dict[str, float] | None = None
     ) -> ChatResponse:
-        try:
-            memory = memory_store.get(conversation_key)
-
-            if memory is None:
-                memory = MemoryState(
-                    last_intent=None,
-                    last_tables=[],
-                    last_filters={},
-                    last_summary=None,
-                )
+        if timings is None:
+            timings = {}
 
-            schema = await mcp_client.call_tool(
-                tool_name="get_schema",
-                jwt_token=jwt_token,
-                arguments={}
-            )
+        started = time.perf_counter()
+
+        def mark(stage: str):
+            nonlocal started
+            now = time.perf_counter()
+            timings[stage] = (now - started) * 1000
+            started = now
+
+        try:
+            memory = await self._load_memory(conversation_key)
 
-            perm_resp = await mcp_client.call_tool(
-                tool_name="get_user_permissions",
-                jwt_token=jwt_token,
-                arguments={}
+            schema, permissions = await asyncio.gather(
+                context_cache.get_schema(jwt_token),
+                context_cache.get_permissions(jwt_token)
             )
 
-            if isinstance(perm_resp, dict):
-                permissions = perm_resp.get("permissions", [])
-            else:
-                permissions = perm_resp
+            mark("context")
 
             plan = await query_planner.build_plan(
                 user_message=user_message,
@@ -53,30 +77,11 @@ class OrchestratingAgent:
                 permissions=permissions
             )
 
-            if plan.intent == "chat":
-                return ChatResponse(
-                    text="Hello! How can I help you with your data today?",
-                    data=None
-                )
-
-            if plan.intent == "vague":
-                return ChatResponse(
-                    text="I could not clearly understand your request. Please rephrase it with more details.",
-                    data=None
-                )
+            mark("plan")
 
-            if plan.intent == "forbidden":
-                memory_store.set(
-                    conversation_key,
-                    MemoryState(
-                        last_intent="forbidden",
-                        last_tables=memory.last_tables,
-                        last_filters=memory.last_filters,
-                        last_summary=memory.last_summary,
-                    )
-                )
+            if plan.intent != "db":
                 return ChatResponse(
-                    text="You do not have permission to perform this operation on the requested data.",
+                    text=await self._non_db_reply(plan.intent, conversation_key, memory),
                     data=None
                 )
 
@@ -92,35 +97,22 @@ class OrchestratingAgent:
                 if not sql:
                     raise AgentError("Planner produced action without SQL")
 
-                if tool in {
-                    "validate_query",
-                    "dry_run_query",
-                    "run_read_query",
-                    "run_write_query",
-                    "explain_query",
-                    "estimate_query_cost"
-                }:
-                    result = await mcp_client.call_tool(
-                        tool_name=tool,
-                        jwt_token=jwt_token,
-                        arguments={"sql": sql}
-                    )
-                else:
+                if tool not in SUPPORTED_TOOLS:
                     raise AgentError(f"Unsupported tool: {tool}")
 
-                if tool == "run_read_query":
-                    final_data = result
+                result = await mcp_client.call_tool(
+                    tool_name=tool,
+                    jwt_token=jwt_token,
+                    arguments={"sql": sql}
+                )
 
-                elif tool in {
-                    "run_write_query",
-                    "explain_query",
-                    "estimate_query_cost"
-                }:
-                    final_data = [result] if result is not None else []
+                final_data = self._result_data(tool, result, final_data)
 
                 last_sql = sql
                 last_tool = tool
 
+            mark("tools")
+
             new_memory = self._update_memory(
                 old=memory,
                 user_message=user_message,
@@ -128,7 +120,7 @@ class OrchestratingAgent:
                 data=final_data
             )
 
-            memory_store.set(conversation_key, new_memory)
+            await memory_store.aset(conversation_key, new_memory)
 
             return ChatResponse(
                 text=self._build_text(last_tool, final_data),
@@ -136,18 +128,8 @@ class OrchestratingAgent:
             )
 
         except MCPClientError as e:
-            msg = str(e).lower()
-
-            if (
-                "permission" in msg
-                 or "not allowed" in msg
-                 or "forbidden" in msg
-                 or "unauthorized" in msg
-                ):
-                return ChatResponse(
-                   text="You do not have permission to perform this operation on the requested data.",
-                   data=None
-                )
+            if _is_permission_error(e):
+                return ChatResponse(text=FORBIDDEN_TEXT, data=None)
 
             raise AgentError(str(e))
 
@@ -156,16 +138,187 @@ class OrchestratingAgent:
             traceback.print_exc()
             raise AgentError(str(e))
 
+    async def stream_message(
+        self,
+        *,
+        conversation_key: str,
+        user_message: str,
+        jwt_token: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        try:
+            memory = await self._load_memory(conversation_key)
+
+            schema, permissions = await asyncio.gather(
+                context_cache.get_schema(jwt_token),
+                context_cache.get_permissions(jwt_token)
+            )
+
+            plan = await query_planner.build_plan(
+                user_message=user_message,
+                memory=memory,
+                schema=schema,
+                permissions=permissions
+            )
+
+            yield "intent", {"intent": plan.intent}
+
+            if plan.intent != "db":
+                yield "done", {
+                    "text": await self._non_db_reply(plan.intent, conversation_key, memory),
+                    "row_count": 0,
+                }
+                return
+
+            final_data: List[Dict[str, Any]] | None = None
+            row_count: int | None = None
+            last_sql: str | None = None
+            last_tool: str | None = None
+
+            for action in plan.actions:
+                tool = action.tool
+                sql = action.sql
+
+                if not sql:
+                    raise AgentError("Planner produced action without SQL")
+
+                if tool not in SUPPORTED_TOOLS:
+                    raise AgentError(f"Unsupported tool: {tool}")
+
+                yield "sql", {"tool": tool, "sql": sql, "reason": action.reason}
+                yield "tool", {"tool": tool}
+
+                if tool == "run_read_query":
+                    # Rows go straight to the client instead of being buffered.
+                    row_count = 0
+                    async for rows in mcp_client.stream_read_query(jwt_token, sql):
+                        row_count += len(rows)
+                        yield "rows", {"rows": rows}
+
+                else:
+                    result = await mcp_client.call_tool(
+                        tool_name=tool,
+                        jwt_token=jwt_token,
+                        arguments={"sql": sql}
+                    )
+
+                    final_data = self._result_data(tool, result, final_data)
+                    row_count = len(final_data) if final_data is not None else None
+
+                    if final_data:
+                        yield "rows", {"rows": final_data}
+
+                last_sql = sql
+                last_tool = tool
+
+            await memory_store.aset(
+                conversation_key,
+                self._update_memory(
+                    old=memory,
+                    user_message=user_message,
+                    sql=last_sql,
+                    data=final_data,
+                    row_count=row_count
+                )
+            )
+
+            yield "done", {
+                "text": self._build_text(last_tool, final_data, row_count=row_count),
+                "row_count": row_count or 0,
+            }
+
+        except MCPClientError as e:
+            if _is_permission_error(e):
+                yield "done", {"text": FORBIDDEN_TEXT, "row_count": 0}
+                return
+
+            yield "error", {"detail": str(e)}
+
+        except Exception as e:
+            logger.exception("streamed chat request failed")
+            yield "error", {"detail": str(e)}
+
+    async def _load_memory(self, conversation_key: str) -> MemoryState:
+        memory = await memory_store.aget(conversation_key)
+
+        if memory is None:
+            memory = MemoryState(
+                last_intent=None,
+                last_tables=[],
+                last_filters={},
+                last_summary=None,
+            )
+
+        return memory
+
+    async def _non_db_reply(
+        self,
+        intent: str,
+        conversation_key: str,
+        memory: MemoryState
+    ) -> str:
+        if intent == "chat":
+            return "Hello! How can I help you with your data today?"
+
+        if intent == "forbidden":
+            await memory_store.aset(
+                conversation_key,
+                MemoryState(
+                    last_intent="forbidden",
+                    last_tables=memory.last_tables,
+                    last_filters=memory.last_filters,
+                    last_summary=memory.last_summary,
+                )
+            )
+            return FORBIDDEN_TEXT
+
+        return "I could not clearly understand your request. Please rephrase it with more details."
+
+    def _result_data(
+        self,
+        tool: str,
+        result: Any,
+        current: List[Dict[str, Any]] | None
+    ) -> List[Dict[str, Any]] | None:
+        if tool == "run_read_query":
+            return result
+
+        if (
+            tool == "run_write_query"
+            and isinstance(result, dict)
+            and result.get("rows") is not None
+        ):
+            return result["rows"]
+
+        if tool == "execute_write_safely" and isinstance(result, dict):
+            write = result.get("write") or {}
+
+            if write.get("rows") is not None:
+                return write["rows"]
+
+            return [result]
+
+        if tool in {
+            "run_write_query",
+            "explain_query",
+            "estimate_query_cost"
+        }:
+            return [result] if result is not None else []
+
+        return current
+
     def _update_memory(
         self,
         *,
         old: MemoryState,
         user_message: str,
         sql: str | None,
-        data: List[Dict[str, Any]] | None
+        data: List[Dict[str, Any]] | None,
+        row_count: int | None = None
     ) -> MemoryState:
         summary = None
-        if data is not None:
+        if row_count is not None and data is None:
+            summary = f"{row_count} rows"
+        elif data is not None:
             summary = f"{len(data)} rows" if isinstance(data, list) else "result produced"
 
         tables: List[str] = []
@@ -192,18 +345,27 @@ class OrchestratingAgent:
     def _build_text(
         self,
         tool: str | None,
-        data: List[Dict[str, Any]] | None
+        data: List[Dict[str, Any]] | None,
+        row_count: int | None = None
     ) -> str:
         if not tool:
             return "No action executed."
 
         if tool == "run_read_query":
-            count = len(data) if data else 0
+            if row_count is not None:
+                count = row_count
+            else:
+                count = len(data) if data else 0
             return f"Query executed successfully. Returned {count} rows."
 
         if tool == "run_write_query":
             return "Write operation executed successfully."
 
+        if tool == "execute_write_safely":
+            if data and data[0].get("executed") is False:
+                return "Write operation was not executed because the dry run flagged a problem."
+            return "Write operation executed successfully."
+
         if tool == "explain_query":
             return "Query plan generated successfully."
 
@@ -9,11 +9,38 @@ class Settings(BaseSettings):
 
     mcp_base_url: str = Field(..., alias="MCP_BASE_URL")
     mcp_timeout_seconds: int = Field(default=30)
+    mcp_max_connections: int = Field(default=100)
+    mcp_max_keepalive_connections: int = Field(default=20)
+    mcp_keepalive_expiry_seconds: float = Field(default=30.0)
+    mcp_http2: bool = Field(default=False)
 
     openai_api_key: str = Field(..., alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o")
+    openai_base_url: str | None = Field(default=None, alias="OPENAI_BASE_URL")
+    openai_router_model: str = Field(default="gpt-4o-mini")
+    router_enabled: bool = Field(default=True)
 
+    context_cache_ttl_seconds: float = Field(default=30.0)
+    context_cache_max_entries: int = Field(default=1000)
+
+    fast_planner_enabled: bool = Field(default=True)
+
+    plan_cache_enabled: bool = Field(default=True)
+    plan_cache_ttl_seconds: float = Field(default=600.0)
+    plan_cache_max_entries: int = Field(default=2000)
+    plan_cache_similarity_threshold: float | None = Field(default=0.9)
+
+    table_retriever_enabled: bool = Field(default=True)
+    table_retriever_top_k: int = Field(default=3)
+    table_retriever_min_confidence: float = Field(default=0.2)
+    table_retriever_memory_boost: float = Field(default=0.15)
+
+    memory_backend: str = Field(default="sqlite")
     memory_store_path: str = Field(default="./memory_store.json")
+    memory_sqlite_path: str = Field(default="./memory_store.db")
+    memory_cache_max_entries: int = Field(default=10000)
+    memory_ttl_seconds: float = Field(default=30 * 24 * 3600)
+    memory_purge_interval_seconds: float = Field(default=3600)
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.mcp_client import mcp_client
+
+
+class _Entry:
+    __slots__ = ("payload", "etag", "fetched_at")
+
+    def __init__(self, payload: Any, etag: Optional[str]):
+        self.payload = payload
+        self.etag = etag
+        self.fetched_at = time.monotonic()
+
+
+class ContextCache:
+    def __init__(self, *, ttl_seconds: float, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _key(self, tool_name: str, jwt_token: str) -> Tuple[str, str]:
+        return tool_name, hashlib.sha256(jwt_token.encode("utf-8")).hexdigest()
+
+    def _store(self, key: Tuple[str, str], entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+    async def fetch(self, tool_name: str, jwt_token: str) -> Any:
+        key = self._key(tool_name, jwt_token)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        requested_at = time.monotonic()
+
+        # Concurrent requests for the same user share one round trip: anyone
+        # queued behind an in-flight fetch reuses its result. Within the TTL
+        # entries are served as-is; the ETag only makes the refresh after it
+        # cheap.
+        async with lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and (
+                entry.fetched_at >= requested_at
+                or requested_at - entry.fetched_at < self._ttl
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.payload
+
+            try:
+                payload, etag, not_modified = await mcp_client.call_tool_conditional(
+                    tool_name=tool_name,
+                    jwt_token=jwt_token,
+                    etag=entry.etag if entry is not None else None
+                )
+            except Exception:
+                if key not in self._entries and self._locks.get(key) is lock:
+                    del self._locks[key]
+                raise
+
+            if not_modified and entry is not None:
+                entry.fetched_at = time.monotonic()
+                self._entries.move_to_end(key)
+                self.revalidated += 1
+                return entry.payload
+
+            self.misses += 1
+            self._store(key, _Entry(payload, etag))
+            return payload
+
+    async def get_schema(self, jwt_token: str) -> Dict[str, List[str]]:
+        return await self.fetch("get_schema", jwt_token)
+
+    async def get_permissions(self, jwt_token: str) -> List[Dict[str, Any]]:
+        perm_resp = await self.fetch("get_user_permissions", jwt_token)
+
+        if isinstance(perm_resp, dict):
+            return perm_resp.get("permissions", [])
+
+        return perm_resp
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+_settings = get_settings()
+
+context_cache = ContextCache(
+    ttl_seconds=_settings.context_cache_ttl_seconds,
+    max_entries=_settings.context_cache_max_entries
+)
@@ -0,0 +1,176 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.schemas import Plan, PlannedAction
+from app.text_index import singular
+
+
+_GREETING_RE = re.compile(
+    r"^(?:hi|hello|hey|hiya|yo|good (?:morning|afternoon|evening)|thanks|thank you|"
+    r"thx|cheers)(?: there| all| everyone| a lot| so much)?$"
+)
+
+# Only values the fast path can map unambiguously to a status column.
+STATUS_VALUES = (
+    "scheduled", "completed", "cancelled", "canceled", "pending",
+    "rescheduled", "active", "inactive", "rejected", "hired",
+)
+
+_STATUS = "|".join(STATUS_VALUES)
+_CITY = r"(?: (?:in|from|located in|based in) (?P<city>[a-z][a-z ]{0,40}))?"
+
+_READ_RE = re.compile(
+    r"^(?:(?:please )?(?:show|list|get|display|fetch|give|find)(?: me)? )?"
+    rf"(?:all )?(?:the )?(?:(?P<status>{_STATUS}) )?(?P<table>[a-z_]+){_CITY}$"
+)
+
+_COUNT_RE = re.compile(
+    rf"^(?:count(?: all)?(?: the)?|how many|number of|total)(?: (?P<status>{_STATUS}))?"
+    rf" (?P<table>[a-z_]+)(?: (?P<status_after>{_STATUS}))?(?: (?:are|is)(?: there)?)?"
+    rf"{_CITY}(?: are there)?$"
+)
+
+# A city value containing any of these is really a compound request.
+_CITY_STOP_WORDS = {
+    "and", "or", "not", "but", "with", "without", "where", "whose", "who",
+    "having", "named", "except", "order", "sorted", "by", "newest", "latest",
+    "oldest", "first", "last", "top", "limit",
+}
+
+READ_LIMIT = 50
+
+
+class FastPlanner:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+            }
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def plan(
+        self,
+        *,
+        user_message: str,
+        schema: Dict[str, List[str]],
+        permissions: Any
+    ) -> Optional[Plan]:
+        plan = self._plan(user_message, schema, permissions)
+        self._record(plan is not None)
+        return plan
+
+    def _plan(
+        self,
+        user_message: str,
+        schema: Dict[str, List[str]],
+        permissions: Any
+    ) -> Optional[Plan]:
+        text = " ".join(re.sub(r"[?.,!]+", " ", user_message.lower()).split())
+
+        if _GREETING_RE.match(text):
+            return Plan(intent="chat", actions=[])
+
+        match = _COUNT_RE.match(text)
+        count = match is not None
+
+        if match is None:
+            match = _READ_RE.match(text)
+
+        if match is None:
+            return None
+
+        groups = match.groupdict()
+        table = self._resolve_table(groups["table"], schema)
+        if table is None:
+            return None
+
+        status = groups.get("status") or groups.get("status_after")
+        city = (groups.get("city") or "").strip()
+
+        readable = self._readable_columns(table, schema, permissions)
+        if not readable:
+            return None
+
+        filters: List[str] = []
+
+        if status:
+            if "status" not in readable:
+                return None
+            filters.append(f"LOWER(status) = LOWER('{status}')")
+
+        if city:
+            if "city" not in readable or _CITY_STOP_WORDS.intersection(city.split()):
+                return None
+            filters.append(f"LOWER(city) = LOWER('{city}')")
+
+        where = f" WHERE {' AND '.join(filters)}" if filters else ""
+
+        if count:
+            sql = f"SELECT COUNT(*) FROM {table}{where}"
+            reason = f"Count {table}"
+        else:
+            sql = f"SELECT {', '.join(readable)} FROM {table}{where} LIMIT {READ_LIMIT}"
+            reason = f"List {table}"
+
+        if filters:
+            reason += " matching the requested filters"
+
+        return Plan(
+            intent="db",
+            actions=[PlannedAction(tool="run_read_query", sql=sql, reason=reason)]
+        )
+
+    def _resolve_table(self, word: str, schema: Dict[str, List[str]]) -> Optional[str]:
+        if word in schema:
+            return word
+
+        matches = [
+            table for table in schema
+            if singular(table) == singular(word)
+        ]
+
+        return matches[0] if len(matches) == 1 else None
+
+    def _readable_columns(
+        self,
+        table: str,
+        schema: Dict[str, List[str]],
+        permissions: Any
+    ) -> Optional[List[str]]:
+        # Anything the permissions do not clearly allow is left to the LLM,
+        # which is responsible for answering "forbidden".
+        if not isinstance(permissions, list):
+            return None
+
+        for p in permissions:
+            if not isinstance(p, dict) or p.get("table_name") != table:
+                continue
+
+            if not p.get("can_read"):
+                return None
+
+            allowed = p.get("allowed_columns")
+            if allowed is None:
+                return list(schema[table])
+
+            return [c for c in schema[table] if c in allowed]
+
+        return None
+
+
+fast_planner = FastPlanner()
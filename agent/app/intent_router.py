@@ -0,0 +1,131 @@
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+from app.schemas import MemoryState
+from app.text_index import singular, tokenize
+
+
+logger = logging.getLogger(__name__)
+
+ROUTER_PROMPT = """
+You classify messages sent to a database assistant.
+
+Return ONLY a JSON object of the form:
+{"intent": "chat | vague | db"}
+
+- chat: greetings, thanks, small talk or questions about the assistant itself.
+- db: anything that reads, counts, searches, changes or deletes data, or refers
+  to data from the previous request.
+- vague: a data request too unclear to act on.
+
+When unsure, answer db.
+""".strip()
+
+# Words that only make sense as a data request, whatever the table is called.
+_DB_WORDS = {
+    "show", "list", "count", "find", "search", "get", "fetch", "display",
+    "select", "update", "delete", "remove", "insert", "add", "create", "set",
+    "mark", "change", "cancel", "reschedule", "many", "total", "average",
+    "latest", "newest", "oldest", "records", "rows", "where", "explain",
+}
+
+
+class TierStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+
+    def observe(self, tier: str, duration_ms: float):
+        with self._lock:
+            stats = self._tiers.setdefault(tier, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["calls"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tier: {
+                    "calls": int(stats["calls"]),
+                    "avg_ms": round(stats["total_ms"] / stats["calls"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                }
+                for tier, stats in sorted(self._tiers.items())
+            }
+
+
+tier_stats = TierStats()
+
+
+class IntentRouter:
+    def __init__(self):
+        self._settings = get_settings()
+
+    def local_intent(
+        self,
+        *,
+        user_message: str,
+        schema: Dict[str, List[str]]
+    ) -> Optional[str]:
+        words = {singular(t) for t in tokenize(user_message)}
+        tables = {singular(t) for t in schema} if isinstance(schema, dict) else set()
+
+        if words & tables or words & _DB_WORDS or re.search(r"\d", user_message):
+            return "db"
+
+        return None
+
+    async def classify(
+        self,
+        *,
+        client,
+        user_message: str,
+        memory: Optional[MemoryState],
+        schema: Dict[str, List[str]]
+    ) -> str:
+        local = self.local_intent(user_message=user_message, schema=schema)
+        if local is not None:
+            return local
+
+        tables = ", ".join(sorted(schema)) if isinstance(schema, dict) else ""
+        previous = memory.last_intent if memory is not None and memory.last_intent else "none"
+
+        started = time.perf_counter()
+        try:
+            response = await client.chat.completions.create(
+                model=self._settings.openai_router_model,
+                messages=[
+                    {"role": "system", "content": ROUTER_PROMPT},
+                    {
+                        "role": "user",
+                        "content": (
+                            f"Tables: {tables}\n\n"
+                            f"Previous request:\n{previous}\n\n"
+                            f"User message:\n{user_message}"
+                        ),
+                    },
+                ],
+                temperature=0,
+            )
+
+            content = response.choices[0].message.content or ""
+            start, end = content.find("{"), content.rfind("}")
+            intent = json.loads(content[start:end + 1]).get("intent")
+
+        except Exception:
+            # The full planner is always a safe answer.
+            logger.warning("intent router failed; using the full planner", exc_info=True)
+            return "db"
+
+        finally:
+            tier_stats.observe("router", (time.perf_counter() - started) * 1000)
+
+        return intent if intent in {"chat", "vague", "db"} else "db"
+
+
+intent_router = IntentRouter()
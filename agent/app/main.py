@@ -1,12 +1,34 @@
-from fastapi import FastAPI, HTTPException, status, Header
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from fastapi import FastAPI, HTTPException, status, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from app.schemas import ChatRequest, ChatResponse
 from app.agent import agent, AgentError
-from app.mcp_client import mcp_client   
+from app.context_cache import context_cache
+from app.fast_planner import fast_planner
+from app.intent_router import tier_stats
+from app.logging_setup import setup_logging
+from app.mcp_client import mcp_client, MCPClientError
+from app.plan_cache import plan_cache
+
+
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await mcp_client.start()
+    try:
+        yield
+    finally:
+        await mcp_client.close()
 
 
-app = FastAPI(title="MCP Agent Service")
+app = FastAPI(title="MCP Agent Service", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,9 +39,16 @@ app.add_middleware(
 )
 
 
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(
+        f"{stage};dur={duration:.1f}" for stage, duration in timings.items()
+    )
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
+    response: Response,
     authorization: str | None = Header(default=None),
 ):
     try:
@@ -33,13 +62,19 @@ async def chat(
 
         conversation_key = f"user:{request.user_id}"
 
-        response = await agent.handle_message(
+        timings: Dict[str, float] = {}
+
+        result = await agent.handle_message(
             conversation_key=conversation_key,
             user_message=request.message,
             jwt_token=jwt_token,
+            timings=timings,
         )
 
-        return response
+        if timings:
+            response.headers["Server-Timing"] = _server_timing(timings)
+
+        return result
 
     except AgentError as e:
         raise HTTPException(
@@ -60,6 +95,38 @@ async def chat(
 
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    authorization: str | None = Header(default=None),
+):
+    if not authorization or not authorization.lower().startswith("bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authorization header",
+        )
+
+    jwt_token = authorization.split(" ", 1)[1].strip()
+
+    async def events():
+        async for event, data in agent.stream_message(
+            conversation_key=f"user:{request.user_id}",
+            user_message=request.message,
+            jwt_token=jwt_token,
+        ):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/me/permissions")
 async def get_my_permissions(
     authorization: str | None = Header(default=None),
@@ -73,17 +140,7 @@ async def get_my_permissions(
 
         jwt_token = authorization.split(" ", 1)[1].strip()
 
-        tool_resp = await mcp_client.call_tool(
-            tool_name="get_user_permissions",
-            jwt_token=jwt_token,
-            arguments={}
-        )
-
-       
-        if isinstance(tool_resp, dict):
-            return tool_resp.get("permissions", [])
-
-        return tool_resp
+        return await context_cache.get_permissions(jwt_token)
 
     except AgentError as e:
         raise HTTPException(
@@ -101,3 +158,31 @@ async def get_my_permissions(
             status_code=500,
             detail=str(e),
         )
+
+
+@app.get("/stats/planner")
+async def get_planner_stats(
+    authorization: str | None = Header(default=None),
+):
+    if not authorization or not authorization.lower().startswith("bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authorization header",
+        )
+
+    # The agent cannot verify tokens itself; the backend does it while
+    # returning the (cached) permissions for the caller.
+    try:
+        await context_cache.get_permissions(authorization.split(" ", 1)[1].strip())
+    except MCPClientError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+    return {
+        "fast_path": fast_planner.stats(),
+        "plan_cache": plan_cache.stats(),
+        "context_cache": context_cache.stats(),
+        "tiers": tier_stats.as_dict(),
+    }
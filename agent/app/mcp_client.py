@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -14,6 +15,7 @@ class MCPClient:
         self._settings = get_settings()
         self._base = self._settings.mcp_base_url.rstrip("/")
         self._timeout = self._settings.mcp_timeout_seconds
+        self._client: httpx.AsyncClient | None = None
 
         self._tool_map: Dict[str, Dict[str, Any]] = {
             "get_schema": {"method": "GET", "path": "/mcp/tools/get_schema"},
@@ -21,12 +23,48 @@ class MCPClient:
             "validate_query": {"method": "POST", "path": "/mcp/tools/validate_query"},
             "dry_run_query": {"method": "POST", "path": "/mcp/tools/dry_run_query"},
             "run_read_query": {"method": "POST", "path": "/mcp/tools/run_read_query"},
+            "stream_read_query": {"method": "POST", "path": "/mcp/tools/stream_read_query"},
             "run_write_query": {"method": "POST", "path": "/mcp/tools/run_write_query"},
+            "run_bulk_insert": {"method": "POST", "path": "/mcp/tools/run_bulk_insert"},
+            "run_write_transaction": {"method": "POST", "path": "/mcp/tools/run_write_transaction"},
+            "execute_write_safely": {"method": "POST", "path": "/mcp/tools/execute_write_safely"},
             "explain_query": {"method": "POST", "path": "/mcp/tools/explain_query"},
             "estimate_query_cost": {"method": "POST", "path": "/mcp/tools/estimate_query_cost"},
             "audit_query_history": {"method": "GET", "path": "/mcp/tools/audit_query_history"},
+            "recommend_indexes": {"method": "POST", "path": "/mcp/tools/recommend_indexes"},
         }
 
+    def _build_client(self) -> httpx.AsyncClient:
+        try:
+            return httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._settings.mcp_max_connections,
+                    max_keepalive_connections=self._settings.mcp_max_keepalive_connections,
+                    keepalive_expiry=self._settings.mcp_keepalive_expiry_seconds,
+                ),
+                http2=self._settings.mcp_http2,
+            )
+        except ImportError as e:
+            raise MCPClientError(
+                "HTTP/2 requires the 'h2' package (pip install 'httpx[http2]')"
+            ) from e
+
+    async def start(self) -> None:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+
+        return self._client
+
     def _headers(self, jwt_token: str) -> Dict[str, str]:
         if not jwt_token:
             raise MCPClientError("Missing JWT token")
@@ -52,41 +90,115 @@ class MCPClient:
         url = f"{self._base}{path}"
 
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                if method == "GET":
-                    resp = await client.get(
-                        url,
-                        headers=self._headers(jwt_token),
-                        params=arguments or {},
-                    )
-                else:
-                    resp = await client.post(
-                        url,
-                        headers=self._headers(jwt_token),
-                        json=arguments or {},
-                    )
+            client = self._get_client()
+
+            if method == "GET":
+                resp = await client.get(
+                    url,
+                    headers=self._headers(jwt_token),
+                    params=arguments or {},
+                )
+            else:
+                resp = await client.post(
+                    url,
+                    headers=self._headers(jwt_token),
+                    json=arguments or {},
+                )
+
+            self._raise_for_status(resp)
+
+            if not resp.content:
+                return None
+
+            return resp.json()
+
+        except httpx.RequestError as e:
+            raise MCPClientError(str(e)) from e
+
+    async def call_tool_conditional(
+        self,
+        *,
+        tool_name: str,
+        jwt_token: str,
+        etag: Optional[str] = None,
+    ) -> Tuple[Any, Optional[str], bool]:
+        if tool_name not in self._tool_map:
+            raise MCPClientError(f"Unknown MCP tool: {tool_name}")
+
+        tool = self._tool_map[tool_name]
+        if tool["method"] != "GET":
+            raise MCPClientError(f"MCP tool does not support conditional requests: {tool_name}")
+
+        headers = self._headers(jwt_token)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        try:
+            resp = await self._get_client().get(f"{self._base}{tool['path']}", headers=headers)
+
+            if resp.status_code == 304:
+                return None, resp.headers.get("ETag") or etag, True
+
+            self._raise_for_status(resp)
+
+            payload = resp.json() if resp.content else None
+            return payload, resp.headers.get("ETag"), False
+
+        except httpx.RequestError as e:
+            raise MCPClientError(str(e)) from e
+
+    async def stream_tool(
+        self,
+        *,
+        tool_name: str,
+        jwt_token: str,
+        arguments: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if tool_name not in self._tool_map:
+            raise MCPClientError(f"Unknown MCP tool: {tool_name}")
 
+        tool = self._tool_map[tool_name]
+
+        try:
+            async with self._get_client().stream(
+                tool["method"],
+                f"{self._base}{tool['path']}",
+                headers=self._headers(jwt_token),
+                json=arguments or {},
+            ) as resp:
                 if resp.status_code >= 400:
-                    try:
-                        payload = resp.json()
-                        message = (
-                            payload.get("detail")
-                            or payload.get("message")
-                            or resp.text
-                        )
-                    except Exception:
-                        message = resp.text
+                    await resp.aread()
+                    self._raise_for_status(resp)
 
-                    raise MCPClientError(message)
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
 
-                if not resp.content:
-                    return None
+                    message = json.loads(line)
+                    if "error" in message:
+                        raise MCPClientError(message["error"])
 
-                return resp.json()
+                    yield message
 
         except httpx.RequestError as e:
             raise MCPClientError(str(e)) from e
 
+    def _raise_for_status(self, resp: httpx.Response) -> None:
+        if resp.status_code < 400:
+            return
+
+        try:
+            payload = resp.json()
+            message = (
+                payload.get("detail")
+                or payload.get("message")
+                or resp.text
+            )
+        except Exception:
+            message = resp.text
+
+        raise MCPClientError(message)
+
     async def get_schema(self, jwt_token: str) -> Dict[str, List[str]]:
         return await self.call_tool(
             tool_name="get_schema",
@@ -108,11 +220,16 @@ class MCPClient:
             arguments={"sql": sql},
         )
 
-    async def dry_run_query(self, jwt_token: str, sql: str) -> Dict[str, Any]:
+    async def dry_run_query(
+        self,
+        jwt_token: str,
+        sql: str,
+        analyze: bool = False,
+    ) -> Dict[str, Any]:
         return await self.call_tool(
             tool_name="dry_run_query",
             jwt_token=jwt_token,
-            arguments={"sql": sql},
+            arguments={"sql": sql, "analyze": analyze},
         )
 
     async def run_read_query(self, jwt_token: str, sql: str) -> List[Dict[str, Any]]:
@@ -122,18 +239,82 @@ class MCPClient:
             arguments={"sql": sql},
         )
 
-    async def run_write_query(self, jwt_token: str, sql: str) -> Dict[str, Any]:
+    async def stream_read_query(
+        self,
+        jwt_token: str,
+        sql: str,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        args: Dict[str, Any] = {"sql": sql}
+        if batch_size is not None:
+            args["batch_size"] = batch_size
+
+        async for message in self.stream_tool(
+            tool_name="stream_read_query",
+            jwt_token=jwt_token,
+            arguments=args,
+        ):
+            if "rows" in message:
+                yield message["rows"]
+
+    async def run_write_query(
+        self,
+        jwt_token: str,
+        sql: str,
+        confirm: bool = False,
+    ) -> Dict[str, Any]:
         return await self.call_tool(
             tool_name="run_write_query",
             jwt_token=jwt_token,
-            arguments={"sql": sql},
+            arguments={"sql": sql, "confirm": confirm},
         )
 
-    async def explain_query(self, jwt_token: str, sql: str) -> Dict[str, Any]:
+    async def run_bulk_insert(
+        self,
+        jwt_token: str,
+        table: str,
+        columns: List[str],
+        rows: List[List[Any]],
+    ) -> Dict[str, Any]:
+        return await self.call_tool(
+            tool_name="run_bulk_insert",
+            jwt_token=jwt_token,
+            arguments={"table": table, "columns": columns, "rows": rows},
+        )
+
+    async def run_write_transaction(
+        self,
+        jwt_token: str,
+        statements: List[str],
+    ) -> Dict[str, Any]:
+        return await self.call_tool(
+            tool_name="run_write_transaction",
+            jwt_token=jwt_token,
+            arguments={"statements": statements},
+        )
+
+    async def execute_write_safely(
+        self,
+        jwt_token: str,
+        sql: str,
+        confirm: bool = False,
+    ) -> Dict[str, Any]:
+        return await self.call_tool(
+            tool_name="execute_write_safely",
+            jwt_token=jwt_token,
+            arguments={"sql": sql, "confirm": confirm},
+        )
+
+    async def explain_query(
+        self,
+        jwt_token: str,
+        sql: str,
+        analyze: bool = False,
+    ) -> Dict[str, Any]:
         return await self.call_tool(
             tool_name="explain_query",
             jwt_token=jwt_token,
-            arguments={"sql": sql},
+            arguments={"sql": sql, "analyze": analyze},
         )
 
     async def estimate_query_cost(self, jwt_token: str, sql: str) -> Dict[str, Any]:
@@ -1,19 +1,39 @@
+import asyncio
 import json
+import logging
 import os
+import sqlite3
 import threading
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from app.config import get_settings
 from app.schemas import MemoryState
 
 
+logger = logging.getLogger(__name__)
+
 _lock = threading.Lock()
 
 
-class MemoryStore:
-    def __init__(self):
-        self._settings = get_settings()
-        self._path = self._settings.memory_store_path
+class MemoryBackend:
+    def get(self, conversation_key: str) -> Optional[Tuple[dict, float]]:
+        raise NotImplementedError
+
+    def set(self, conversation_key: str, state: dict, updated_at: float):
+        raise NotImplementedError
+
+    def delete(self, conversation_key: str):
+        raise NotImplementedError
+
+    def purge_older_than(self, cutoff: float) -> int:
+        raise NotImplementedError
+
+
+class JsonFileBackend(MemoryBackend):
+    def __init__(self, path: str):
+        self._path = path
         self._ensure_store()
 
     def _ensure_store(self):
@@ -38,38 +58,260 @@ class MemoryStore:
             json.dump(data, f, ensure_ascii=False)
         os.replace(tmp_path, self._path)
 
+    def get(self, conversation_key: str) -> Optional[Tuple[dict, float]]:
+        with _lock:
+            raw = self._load_all().get(conversation_key)
+
+        if not raw:
+            return None
+
+        # The JSON layout predates timestamps, so entries never look stale.
+        return raw, time.time()
+
+    def set(self, conversation_key: str, state: dict, updated_at: float):
+        with _lock:
+            data = self._load_all()
+            data[conversation_key] = state
+            self._save_all(data)
+
+    def delete(self, conversation_key: str):
+        with _lock:
+            data = self._load_all()
+            if conversation_key in data:
+                del data[conversation_key]
+                self._save_all(data)
+
+    def purge_older_than(self, cutoff: float) -> int:
+        return 0
+
+
+class SQLiteBackend(MemoryBackend):
+    def __init__(self, path: str, *, legacy_json_path: Optional[str] = None):
+        self._path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                " key TEXT PRIMARY KEY,"
+                " state TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_conversations_updated_at"
+                " ON conversations (updated_at)"
+            )
+
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers run alongside a writer.
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        return conn
+
+    def _migrate_json(self, json_path: str):
+        if not os.path.exists(json_path):
+            return
+
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            logger.warning("could not read legacy memory store %s; skipping migration", json_path)
+            return
+
+        now = time.time()
+        conn = self._conn()
+
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO conversations (key, state, updated_at) VALUES (?, ?, ?)",
+                [
+                    (key, json.dumps(state, ensure_ascii=False), now)
+                    for key, state in data.items()
+                    if isinstance(state, dict)
+                ]
+            )
+
+        try:
+            os.replace(json_path, f"{json_path}.migrated")
+        except FileNotFoundError:
+            # Another worker finished the same migration first.
+            pass
+
+        logger.info("migrated %d conversations from %s to %s", len(data), json_path, self._path)
+
+    def get(self, conversation_key: str) -> Optional[Tuple[dict, float]]:
+        row = self._conn().execute(
+            "SELECT state, updated_at FROM conversations WHERE key = ?",
+            (conversation_key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            return None
+
+    def set(self, conversation_key: str, state: dict, updated_at: float):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO conversations (key, state, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET state = excluded.state,"
+                " updated_at = excluded.updated_at",
+                (conversation_key, json.dumps(state, ensure_ascii=False), updated_at)
+            )
+
+    def delete(self, conversation_key: str):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM conversations WHERE key = ?", (conversation_key,))
+
+    def purge_older_than(self, cutoff: float) -> int:
+        conn = self._conn()
+        with conn:
+            return conn.execute(
+                "DELETE FROM conversations WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+
+
+class MemoryStore:
+    def __init__(self, backend: Optional[MemoryBackend] = None):
+        self._settings = get_settings()
+        self._backend = backend or self._build_backend()
+        self._ttl = self._settings.memory_ttl_seconds
+        self._max_entries = self._settings.memory_cache_max_entries
+        self._cache: "OrderedDict[str, Tuple[MemoryState, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _build_backend(self) -> MemoryBackend:
+        backend = self._settings.memory_backend
+
+        if backend == "json":
+            return JsonFileBackend(self._settings.memory_store_path)
+
+        if backend == "sqlite":
+            return SQLiteBackend(
+                self._settings.memory_sqlite_path,
+                legacy_json_path=self._settings.memory_store_path
+            )
+
+        raise RuntimeError(f"Unknown memory backend: {backend}")
+
+    def _expired(self, updated_at: float) -> bool:
+        return bool(self._ttl) and time.time() - updated_at > self._ttl
+
+    def _remember(self, conversation_key: str, state: MemoryState, updated_at: float):
+        with self._cache_lock:
+            self._cache[conversation_key] = (state, updated_at)
+            self._cache.move_to_end(conversation_key)
+
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+
+    def _cached(self, conversation_key: str) -> Optional[MemoryState]:
+        with self._cache_lock:
+            entry = self._cache.get(conversation_key)
+            if entry is None:
+                return None
+
+            state, updated_at = entry
+            if self._expired(updated_at):
+                del self._cache[conversation_key]
+                return None
+
+            self._cache.move_to_end(conversation_key)
+            return state.model_copy(deep=True)
+
+    def _maybe_purge(self):
+        if not self._ttl:
+            return
+
+        now = time.time()
+        if now - self._last_purge < self._settings.memory_purge_interval_seconds:
+            return
+
+        self._last_purge = now
+        try:
+            purged = self._backend.purge_older_than(now - self._ttl)
+            if purged:
+                logger.info("purged %d stale conversations", purged)
+        except Exception:
+            logger.warning("memory purge failed", exc_info=True)
+
     def get(self, conversation_key: str) -> MemoryState:
         if not conversation_key:
             return MemoryState()
 
-        with _lock:
-            data = self._load_all()
-            raw = data.get(conversation_key)
-            if not raw:
-                return MemoryState()
-            try:
-                return MemoryState(**raw)
-            except Exception:
-                return MemoryState()
+        cached = self._cached(conversation_key)
+        if cached is not None:
+            return cached
+
+        loaded = self._backend.get(conversation_key)
+        if loaded is None:
+            return MemoryState()
+
+        raw, updated_at = loaded
+
+        if self._expired(updated_at):
+            self._backend.delete(conversation_key)
+            return MemoryState()
+
+        try:
+            state = MemoryState(**raw)
+        except Exception:
+            return MemoryState()
+
+        self._remember(conversation_key, state, updated_at)
+        return state.model_copy(deep=True)
 
     def set(self, conversation_key: str, state: MemoryState):
         if not conversation_key:
             return
 
-        with _lock:
-            data = self._load_all()
-            data[conversation_key] = state.model_dump()
-            self._save_all(data)
+        updated_at = time.time()
+        self._backend.set(conversation_key, state.model_dump(), updated_at)
+        self._remember(conversation_key, state.model_copy(deep=True), updated_at)
+        self._maybe_purge()
 
     def clear(self, conversation_key: str):
         if not conversation_key:
             return
 
-        with _lock:
-            data = self._load_all()
-            if conversation_key in data:
-                del data[conversation_key]
-                self._save_all(data)
+        with self._cache_lock:
+            self._cache.pop(conversation_key, None)
+
+        self._backend.delete(conversation_key)
+
+    async def aget(self, conversation_key: str) -> MemoryState:
+        cached = self._cached(conversation_key) if conversation_key else None
+        if cached is not None:
+            return cached
+
+        return await asyncio.to_thread(self.get, conversation_key)
+
+    async def aset(self, conversation_key: str, state: MemoryState):
+        await asyncio.to_thread(self.set, conversation_key, state)
+
+    async def aclear(self, conversation_key: str):
+        await asyncio.to_thread(self.clear, conversation_key)
 
 
 memory_store = MemoryStore()
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import get_settings
+from app.schemas import MemoryState, Plan
+from app.text_index import TextIndex
+
+
+# Follow-up phrasing depends on the previous turn, so for those messages the
+# previous request is part of the cache key.
+_CONTEXTUAL_WORDS = {
+    "it", "its", "them", "they", "those", "these", "that", "this", "same",
+    "previous", "again", "above", "more", "also", "only", "instead", "now",
+}
+
+# Only plans made of these tools are cached; a reused write plan would replay
+# the literals of whichever message was cached first.
+_READ_ONLY_TOOLS = {"run_read_query", "explain_query", "estimate_query_cost"}
+
+_LITERAL_RE = re.compile(r"[A-Za-z0-9@._%-]+")
+
+# Words that may differ between two messages without changing the request.
+_FILLER_WORDS = {
+    "a", "an", "the", "all", "me", "my", "please", "can", "could", "would",
+    "you", "show", "list", "display", "get", "give", "fetch", "find", "see",
+    "view", "i", "want", "to", "of", "every", "entire", "whole", "records",
+    "rows", "data", "details",
+}
+
+
+def normalize_message(message: str) -> str:
+    # Case is kept: "Pune" and "PUNE" may be different values in a filter.
+    return " ".join(re.sub(r"[?!.,;]+$", "", message.strip()).split())
+
+
+def stable_hash(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _memory_hash(message: str, memory: Optional[MemoryState]) -> str:
+    if memory is None:
+        return stable_hash(None)
+
+    relevant: Dict[str, Any] = {
+        "last_tables": sorted(memory.last_tables),
+        "last_filters": memory.last_filters,
+    }
+
+    if _CONTEXTUAL_WORDS.intersection(message.lower().split()):
+        relevant["last_intent"] = memory.last_intent
+
+    return stable_hash(relevant)
+
+
+def _content_tokens(message: str) -> Tuple[str, ...]:
+    # Order and case matter: "candidate 3 with interviewer 5" and "candidate 5
+    # with interviewer 3" share every token but ask for different rows.
+    tokens = (t.strip("._-") for t in _LITERAL_RE.findall(message))
+    return tuple(t for t in tokens if t and t.lower() not in _FILLER_WORDS)
+
+
+def is_cacheable(plan: Plan) -> bool:
+    return all(a.tool in _READ_ONLY_TOOLS for a in plan.actions)
+
+
+class _Entry:
+    __slots__ = ("plan", "content", "stored_at")
+
+    def __init__(self, plan: Plan, content: Tuple[str, ...]):
+        self.plan = plan
+        self.content = content
+        self.stored_at = time.monotonic()
+
+
+class PlanCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        similarity_threshold: Optional[float]
+    ):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._indexes: Dict[str, TextIndex] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def context_key(
+        self,
+        *,
+        message: str,
+        schema: Any,
+        permissions: Any,
+        memory: Optional[MemoryState]
+    ) -> str:
+        return stable_hash([
+            stable_hash(schema),
+            stable_hash(permissions),
+            _memory_hash(message, memory),
+        ])
+
+    def _drop(self, key: Tuple[str, str]):
+        self._entries.pop(key, None)
+
+        index = self._indexes.get(key[0])
+        if index is not None:
+            index.remove(key[1])
+            if not len(index):
+                del self._indexes[key[0]]
+
+    def _live(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry.stored_at >= self._ttl:
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, message: str, context: str) -> Optional[Plan]:
+        with self._lock:
+            entry = self._live((context, message))
+            if entry is not None:
+                self.hits += 1
+                return entry.plan.model_copy(deep=True)
+
+            index = self._indexes.get(context)
+            if self._threshold and index is not None:
+                content = _content_tokens(message)
+
+                for candidate, _ in index.query(message, top_k=3, min_score=self._threshold):
+                    entry = self._live((context, candidate))
+
+                    # Similar wording is not enough: the tables, columns and
+                    # literals must match the cached request in the same order,
+                    # so only filler words may differ.
+                    if entry is not None and entry.content == content:
+                        self.near_hits += 1
+                        return entry.plan.model_copy(deep=True)
+
+            self.misses += 1
+            return None
+
+    def put(self, message: str, context: str, plan: Plan):
+        if not is_cacheable(plan):
+            return
+
+        key = (context, message)
+
+        with self._lock:
+            self._entries[key] = _Entry(plan.model_copy(deep=True), _content_tokens(message))
+            self._entries.move_to_end(key)
+
+            if self._threshold:
+                self._indexes.setdefault(context, TextIndex()).add(message, message)
+
+            while len(self._entries) > self._max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._indexes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+            }
+
+
+_settings = get_settings()
+
+plan_cache = PlanCache(
+    ttl_seconds=_settings.plan_cache_ttl_seconds,
+    max_entries=_settings.plan_cache_max_entries,
+    similarity_threshold=_settings.plan_cache_similarity_threshold
+)
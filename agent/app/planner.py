@@ -1,205 +1,35 @@
 import json
+import logging
 import re
+import time
 from typing import Any, Dict
 
 from openai import AsyncOpenAI
 
 from app.config import get_settings
-from app.schemas import Plan, MemoryState
+from app.fast_planner import fast_planner
+from app.intent_router import intent_router, tier_stats
+from app.plan_cache import normalize_message, plan_cache
+from app.schemas import Plan, PlannedAction, MemoryState
+from app.table_retriever import table_retriever
 
 
-class PlanningError(Exception):
-    pass
-
-
-class QueryPlanner:
-    def __init__(self):
-        self._settings = get_settings()
-        self._client = AsyncOpenAI(api_key=self._settings.openai_api_key)
-
-        self._allowed_tools = {
-            "validate_query",
-            "dry_run_query",
-            "run_read_query",
-            "run_write_query",
-            "explain_query",
-            "estimate_query_cost",
-        }
-
-        self._allowed_intents = {"chat", "vague", "forbidden", "db"}
-
-    async def build_plan(
-        self,
-        *,
-        user_message: str,
-        memory: MemoryState,
-        schema: Dict[str, Any],
-        permissions: Any,
-    ) -> Plan:
-
-        if memory is None:
-            memory = MemoryState(
-                last_intent=None,
-                last_tables=[],
-                last_filters=None,
-                last_summary=None,
-            )
-
-        prompt = self._build_prompt(
-            user_message=user_message,
-            memory=memory,
-            schema=schema,
-            permissions=permissions,
-        )
-
-        try:
-            response = await self._client.chat.completions.create(
-                model=self._settings.openai_model,
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0,
-            )
-
-            content = response.choices[0].message.content
-            if not content:
-                raise PlanningError("Empty planner response")
-
-            data = self._extract_json(content)
-            plan = Plan.model_validate(data)
-
-            for a in plan.actions:
-                if a.sql:
-                    a.sql = self._normalize_table_names(a.sql, schema)
-
-            for a in plan.actions:
-                if a.tool == "run_read_query":
-                    a.sql = self._enforce_projection(a.sql, permissions)
-
-            self._validate_plan(plan, user_message)
-
-            return plan
-
-        except PlanningError:
-            raise
-        except Exception as e:
-            raise PlanningError("Failed to build execution plan") from e
-
-    def _normalize_table_names(self, sql: str, schema: Dict[str, Any]) -> str:
-        tables = set(schema.keys())
-
-        def repl(match):
-            name = match.group(1)
-            lname = name.lower()
-            if lname not in tables and lname + "s" in tables:
-                return match.group(0).replace(name, lname + "s")
-            return match.group(0)
-
-        sql = re.sub(r"\bfrom\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
-        sql = re.sub(r"\bupdate\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
-        sql = re.sub(r"\binto\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
-
-        return sql
-
-    def _get_allowed_columns_for_table(self, permissions, table: str):
-        if not isinstance(permissions, list):
-            return None
-
-        for p in permissions:
-            if p.get("table_name") == table:
-                return p.get("allowed_columns")
-
-        return None
-
-    def _enforce_projection(self, sql: str, permissions) -> str:
-        m = re.match(
-            r"^\s*select\s+\*\s+from\s+([a-zA-Z_][a-zA-Z0-9_]*)\b(.*)$",
-            sql,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        if not m:
-            return sql
-
-        table = m.group(1)
-        rest = m.group(2)
-
-        allowed = self._get_allowed_columns_for_table(permissions, table)
-
-        if allowed is None:
-            return sql
-
-        if not allowed:
-            raise PlanningError("No readable columns for this table")
-
-        cols = ", ".join(allowed)
-
-        return f"SELECT {cols} FROM {table}{rest}"
-
-    def _validate_plan(self, plan: Plan, user_message: str) -> None:
-
-        if plan.intent not in self._allowed_intents:
-            raise PlanningError("Invalid intent returned by planner")
-
-        if plan.intent != "db":
-            if plan.actions:
-                raise PlanningError("Non-db intent must not contain actions")
-            return
-
-        if not plan.actions:
-            raise PlanningError("DB intent requires at least one action")
-
-        if len(plan.actions) > 1:
-            tools = [a.tool for a in plan.actions]
-            if tools != ["validate_query", "dry_run_query", "run_write_query"]:
-                raise PlanningError("Invalid tool sequence")
-
-        for a in plan.actions:
-            if a.tool not in self._allowed_tools:
-                raise PlanningError(f"Unsupported tool in plan: {a.tool}")
+logger = logging.getLogger(__name__)
 
-            if not a.sql or not a.sql.strip():
-                raise PlanningError("Planner produced empty SQL")
+SYSTEM_PROMPT = """
+You are a production-grade query planning agent for a secure MCP governed database platform.
+You DO NOT execute queries.
+You ONLY generate a JSON plan that will be executed by MCP tools.
 
-            upper = a.sql.strip().upper()
+Your most important responsibility is:
+- correctly extracting filters, joins and aggregations from natural language
+- never ignoring user constraints
+- never widening the result set beyond what the user asked
 
-            if upper.startswith(("DROP", "TRUNCATE", "ALTER")):
-                raise PlanningError("Destructive SQL detected")
+If the user request mentions any condition (city, email, id, status, name, date, range, latest, count, etc.), you MUST translate it into SQL.
 
-            if a.tool == "run_read_query":
-                if not self._is_aggregation_query(upper):
-                    if "LIMIT" not in upper:
-                        raise PlanningError("Read query must contain LIMIT")
+If a filter can be inferred, it is an ERROR to omit it.
 
-    def _is_aggregation_query(self, upper_sql: str) -> bool:
-        return any(fn in upper_sql for fn in ("COUNT(", "SUM(", "AVG(", "MIN(", "MAX("))
-
-    def _system_prompt(self) -> str:
-        return (
-            "You are a production-grade query planning agent for a secure MCP governed "
-            "database platform.\n"
-            "You DO NOT execute queries.\n"
-            "You ONLY generate a JSON plan that will be executed by MCP tools.\n\n"
-            "Your most important responsibility is:\n"
-            "- correctly extracting filters, joins and aggregations from natural language\n"
-            "- never ignoring user constraints\n"
-            "- never widening the result set beyond what the user asked\n\n"
-            "If the user request mentions any condition (city, email, id, status, name, "
-            "date, range, latest, count, etc.), you MUST translate it into SQL.\n\n"
-            "If a filter can be inferred, it is an ERROR to omit it.\n"
-        )
-
-    def _build_prompt(
-        self,
-        *,
-        user_message: str,
-        memory: MemoryState,
-        schema: Dict[str, Any],
-        permissions: Any,
-    ) -> str:
-
-        return f"""
 You will receive a natural language user request.
 
 Your task:
@@ -209,30 +39,18 @@ Your task:
 4. Identify all filters and constraints
 5. Produce a permission-safe SQL plan
 
-User message:
-{user_message}
-
-Conversation memory:
-{json.dumps(memory.model_dump(), indent=2)}
-
-Database schema:
-{json.dumps(schema, indent=2)}
-
-User permissions:
-{json.dumps(permissions, indent=2)}
-
 You must return ONLY a JSON object of the form:
 
-{{
+{
   "intent": "chat | vague | forbidden | db",
   "actions": [
-    {{
-      "tool": "validate_query | dry_run_query | run_read_query | run_write_query | explain_query | estimate_query_cost",
+    {
+      "tool": "run_read_query | execute_write_safely | explain_query | estimate_query_cost",
       "sql": "single SQL statement only",
       "reason": "short reason"
-    }}
+    }
   ]
-}}
+}
 
 ------------------------------------
 INTERPRETATION & PLANNING RULES
@@ -338,6 +156,13 @@ SQL RULES
 - When no WHERE clause exists, still apply LIMIT 50.
 - For filtered queries, also apply LIMIT 50.
 - Never generate DROP, TRUNCATE, ALTER.
+- For INSERT and UPDATE, append RETURNING with the allowed columns the user
+  wants to see, so the changed rows are returned without a follow-up read.
+  Example: UPDATE candidates SET city = 'Pune' WHERE id = 3 RETURNING id, full_name, city
+- For "add or update" requests on a unique column, use a single upsert
+  instead of a read followed by a write.
+  Example: INSERT INTO candidates (full_name, email) VALUES ('Raj', 'raj@example.com')
+           ON CONFLICT (email) DO UPDATE SET full_name = EXCLUDED.full_name
 
 - For any string column comparison in WHERE clauses
   (for example: full_name, email, city, phone, etc),
@@ -357,10 +182,9 @@ READ:
   run_read_query
 
 WRITE:
-- exactly this sequence:
-  validate_query
-  dry_run_query
-  run_write_query
+- exactly one action:
+  execute_write_safely
+  (it validates, dry-runs and executes the statement in a single call)
 
 ------------------------------------
 INTENT RULES
@@ -368,13 +192,13 @@ INTENT RULES
 
 
 - If a valid DB operation exists:
-  {{ "intent": "db", "actions": [...] }}
+  { "intent": "db", "actions": [...] }
 
 - If permission violation:
-  {{ "intent": "forbidden", "actions": [] }}
+  { "intent": "forbidden", "actions": [] }
 
 - If no safe plan possible:
-  {{ "intent": "vague", "actions": [] }}
+  { "intent": "vague", "actions": [] }
 
 ------------------------------------
 IMPORTANT
@@ -387,6 +211,305 @@ Return ONLY JSON.
 Do not include markdown.
 """.strip()
 
+
+def _canonical_json(value: Any) -> str:
+    if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+        value = sorted(value, key=lambda v: str(v.get("table_name", "")))
+
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class PlanningError(Exception):
+    pass
+
+
+class QueryPlanner:
+    def __init__(self):
+        self._settings = get_settings()
+        self._client = AsyncOpenAI(
+            api_key=self._settings.openai_api_key,
+            base_url=self._settings.openai_base_url
+        )
+
+        self._allowed_tools = {
+            "validate_query",
+            "dry_run_query",
+            "run_read_query",
+            "run_write_query",
+            "execute_write_safely",
+            "explain_query",
+            "estimate_query_cost",
+        }
+
+        self._allowed_intents = {"chat", "vague", "forbidden", "db"}
+
+    async def build_plan(
+        self,
+        *,
+        user_message: str,
+        memory: MemoryState,
+        schema: Dict[str, Any],
+        permissions: Any,
+    ) -> Plan:
+
+        if memory is None:
+            memory = MemoryState(
+                last_intent=None,
+                last_tables=[],
+                last_filters=None,
+                last_summary=None,
+            )
+
+        if self._settings.fast_planner_enabled:
+            fast_plan = fast_planner.plan(
+                user_message=user_message,
+                schema=schema,
+                permissions=permissions
+            )
+
+            if fast_plan is not None:
+                try:
+                    for a in fast_plan.actions:
+                        a.sql = self._enforce_projection(a.sql, permissions)
+
+                    self._validate_plan(fast_plan, user_message)
+                    return fast_plan
+                except PlanningError:
+                    pass
+
+        cache_message = normalize_message(user_message)
+        cache_context = None
+
+        if self._settings.plan_cache_enabled:
+            cache_context = plan_cache.context_key(
+                message=cache_message,
+                schema=schema,
+                permissions=permissions,
+                memory=memory
+            )
+
+            cached = plan_cache.get(cache_message, cache_context)
+            if cached is not None:
+                try:
+                    self._validate_plan(cached, user_message)
+                    return cached
+                except PlanningError:
+                    pass
+
+        if self._settings.router_enabled:
+            intent = await intent_router.classify(
+                client=self._client,
+                user_message=user_message,
+                memory=memory,
+                schema=schema
+            )
+
+            if intent in {"chat", "vague"}:
+                return Plan(intent=intent, actions=[])
+
+        prompt_schema, prompt_permissions = schema, permissions
+
+        if self._settings.table_retriever_enabled:
+            prompt_schema, prompt_permissions = table_retriever.prune(
+                user_message=user_message,
+                schema=schema,
+                permissions=permissions,
+                memory=memory
+            )
+
+        prompt = self._build_prompt(
+            user_message=user_message,
+            memory=memory,
+            schema=prompt_schema,
+            permissions=prompt_permissions,
+        )
+
+        try:
+            started = time.perf_counter()
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self._settings.openai_model,
+                    messages=[
+                        {"role": "system", "content": self._system_prompt()},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0,
+                )
+            finally:
+                tier_stats.observe("planner", (time.perf_counter() - started) * 1000)
+
+            self._log_usage(response)
+
+            content = response.choices[0].message.content
+            if not content:
+                raise PlanningError("Empty planner response")
+
+            data = self._extract_json(content)
+            plan = Plan.model_validate(data)
+
+            for a in plan.actions:
+                if a.sql:
+                    a.sql = self._normalize_table_names(a.sql, schema)
+
+            for a in plan.actions:
+                if a.tool == "run_read_query":
+                    a.sql = self._enforce_projection(a.sql, permissions)
+
+            plan = self._collapse_write_sequence(plan)
+
+            self._validate_plan(plan, user_message)
+
+            if cache_context is not None and plan.intent != "vague":
+                plan_cache.put(cache_message, cache_context, plan)
+
+            return plan
+
+        except PlanningError:
+            raise
+        except Exception as e:
+            raise PlanningError("Failed to build execution plan") from e
+
+    def _log_usage(self, response) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+
+        logger.info(
+            "planner prompt_tokens=%s cached_tokens=%s completion_tokens=%s",
+            usage.prompt_tokens,
+            cached,
+            usage.completion_tokens
+        )
+
+    def _normalize_table_names(self, sql: str, schema: Dict[str, Any]) -> str:
+        tables = set(schema.keys())
+
+        def repl(match):
+            name = match.group(1)
+            lname = name.lower()
+            if lname not in tables and lname + "s" in tables:
+                return match.group(0).replace(name, lname + "s")
+            return match.group(0)
+
+        sql = re.sub(r"\bfrom\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
+        sql = re.sub(r"\bupdate\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
+        sql = re.sub(r"\binto\s+([a-zA-Z_][a-zA-Z0-9_]*)", repl, sql, flags=re.IGNORECASE)
+
+        return sql
+
+    def _get_allowed_columns_for_table(self, permissions, table: str):
+        if not isinstance(permissions, list):
+            return None
+
+        for p in permissions:
+            if p.get("table_name") == table:
+                return p.get("allowed_columns")
+
+        return None
+
+    def _enforce_projection(self, sql: str, permissions) -> str:
+        m = re.match(
+            r"^\s*select\s+\*\s+from\s+([a-zA-Z_][a-zA-Z0-9_]*)\b(.*)$",
+            sql,
+            flags=re.IGNORECASE | re.DOTALL,
+        )
+
+        if not m:
+            return sql
+
+        table = m.group(1)
+        rest = m.group(2)
+
+        allowed = self._get_allowed_columns_for_table(permissions, table)
+
+        if allowed is None:
+            return sql
+
+        if not allowed:
+            raise PlanningError("No readable columns for this table")
+
+        cols = ", ".join(allowed)
+
+        return f"SELECT {cols} FROM {table}{rest}"
+
+    def _collapse_write_sequence(self, plan: Plan) -> Plan:
+        tools = [a.tool for a in plan.actions]
+
+        if tools != ["validate_query", "dry_run_query", "run_write_query"]:
+            return plan
+
+        write = plan.actions[-1]
+
+        return Plan(
+            intent=plan.intent,
+            actions=[
+                PlannedAction(
+                    tool="execute_write_safely",
+                    sql=write.sql,
+                    reason=write.reason,
+                )
+            ],
+        )
+
+    def _validate_plan(self, plan: Plan, user_message: str) -> None:
+
+        if plan.intent not in self._allowed_intents:
+            raise PlanningError("Invalid intent returned by planner")
+
+        if plan.intent != "db":
+            if plan.actions:
+                raise PlanningError("Non-db intent must not contain actions")
+            return
+
+        if not plan.actions:
+            raise PlanningError("DB intent requires at least one action")
+
+        if len(plan.actions) > 1:
+            raise PlanningError("Invalid tool sequence")
+
+        for a in plan.actions:
+            if a.tool not in self._allowed_tools:
+                raise PlanningError(f"Unsupported tool in plan: {a.tool}")
+
+            if not a.sql or not a.sql.strip():
+                raise PlanningError("Planner produced empty SQL")
+
+            upper = a.sql.strip().upper()
+
+            if upper.startswith(("DROP", "TRUNCATE", "ALTER")):
+                raise PlanningError("Destructive SQL detected")
+
+            if a.tool == "run_read_query":
+                if not self._is_aggregation_query(upper):
+                    if "LIMIT" not in upper:
+                        raise PlanningError("Read query must contain LIMIT")
+
+    def _is_aggregation_query(self, upper_sql: str) -> bool:
+        return any(fn in upper_sql for fn in ("COUNT(", "SUM(", "AVG(", "MIN(", "MAX("))
+
+    def _system_prompt(self) -> str:
+        return SYSTEM_PROMPT
+
+    def _build_prompt(
+        self,
+        *,
+        user_message: str,
+        memory: MemoryState,
+        schema: Dict[str, Any],
+        permissions: Any,
+    ) -> str:
+        # Most stable content first so the provider can reuse the cached
+        # prefix; the per-turn memory and message go last.
+        return (
+            f"Database schema:\n{_canonical_json(schema)}\n\n"
+            f"User permissions:\n{_canonical_json(permissions)}\n\n"
+            f"Conversation memory:\n{_canonical_json(memory.model_dump())}\n\n"
+            f"User message:\n{user_message}"
+        )
+
     def _extract_json(self, text: str) -> Dict[str, Any]:
         try:
             start = text.find("{")
@@ -0,0 +1,157 @@
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.plan_cache import stable_hash
+from app.schemas import MemoryState
+from app.text_index import TextIndex, singular, tokenize
+
+
+RELATIVE_CUTOFF = 0.5
+
+
+def _expand(text: str) -> str:
+    tokens = tokenize(text)
+    return " ".join(tokens + [singular(t) for t in tokens if singular(t) != t])
+
+
+def _table_document(table: str, columns: List[str]) -> str:
+    # The table name is repeated so it outweighs any single column name.
+    return _expand(" ".join([table, table, *columns]))
+
+
+def _fk_edges(schema: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    by_singular = {singular(table): table for table in schema}
+    edges: Dict[str, Set[str]] = {table: set() for table in schema}
+
+    for table, columns in schema.items():
+        for column in columns:
+            if not column.endswith("_id"):
+                continue
+
+            name = column[:-3]
+            target = name if name in schema else by_singular.get(name)
+            if target and target != table:
+                edges[table].add(target)
+                edges[target].add(table)
+
+    return edges
+
+
+class _SchemaIndex:
+    def __init__(self, schema: Dict[str, List[str]]):
+        self.index = TextIndex()
+        self.edges = _fk_edges(schema)
+
+        for table, columns in schema.items():
+            self.index.add(table, _table_document(table, columns))
+
+
+class TableRetriever:
+    def __init__(
+        self,
+        *,
+        top_k: int,
+        min_confidence: float,
+        memory_boost: float
+    ):
+        self._top_k = top_k
+        self._min_confidence = min_confidence
+        self._memory_boost = memory_boost
+        self._indexes: Dict[str, _SchemaIndex] = {}
+        self._lock = threading.Lock()
+
+    def _index_for(self, schema: Dict[str, List[str]]) -> _SchemaIndex:
+        key = stable_hash(schema)
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                # Schemas change rarely; keep only the most recent one.
+                self._indexes = {key: _SchemaIndex(schema)}
+                index = self._indexes[key]
+
+            return index
+
+    def retrieve(
+        self,
+        *,
+        user_message: str,
+        schema: Dict[str, List[str]],
+        memory: Optional[MemoryState] = None
+    ) -> Optional[List[str]]:
+        if not isinstance(schema, dict) or len(schema) <= self._top_k:
+            return None
+
+        index = self._index_for(schema)
+        words = set(_expand(user_message).split())
+
+        # Column names are shared across tables (id, email, status), so the
+        # ranking is only trusted when the message names at least one table.
+        mentioned = [
+            table for table in schema
+            if table in words or singular(table) in words
+        ]
+        if not mentioned:
+            return None
+
+        scores: Dict[str, float] = dict(index.index.query(" ".join(sorted(words))))
+        best = max(scores.values(), default=0.0)
+
+        if best < self._min_confidence:
+            return None
+
+        if memory is not None:
+            for table in memory.last_tables:
+                if table in scores:
+                    scores[table] += self._memory_boost
+
+        ranked: List[Tuple[str, float]] = sorted(
+            scores.items(), key=lambda item: item[1], reverse=True
+        )
+
+        selected = list(mentioned)
+        for table, score in ranked:
+            if len(selected) >= self._top_k or score < best * RELATIVE_CUTOFF:
+                break
+            if table not in selected:
+                selected.append(table)
+
+        for table in list(selected):
+            for neighbour in sorted(index.edges.get(table, ())):
+                if neighbour not in selected:
+                    selected.append(neighbour)
+
+        return selected
+
+    def prune(
+        self,
+        *,
+        user_message: str,
+        schema: Dict[str, List[str]],
+        permissions: Any,
+        memory: Optional[MemoryState] = None
+    ) -> Tuple[Dict[str, List[str]], Any]:
+        tables = self.retrieve(user_message=user_message, schema=schema, memory=memory)
+        if tables is None:
+            return schema, permissions
+
+        keep = set(tables)
+        pruned_schema = {t: schema[t] for t in schema if t in keep}
+
+        if isinstance(permissions, list):
+            permissions = [
+                p for p in permissions
+                if not isinstance(p, dict) or p.get("table_name") in keep
+            ]
+
+        return pruned_schema, permissions
+
+
+_settings = get_settings()
+
+table_retriever = TableRetriever(
+    top_k=_settings.table_retriever_top_k,
+    min_confidence=_settings.table_retriever_min_confidence,
+    memory_boost=_settings.table_retriever_memory_boost
+)
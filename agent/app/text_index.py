@@ -0,0 +1,144 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9@._%-]+")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.strip("._-")
+        if not token:
+            continue
+
+        tokens.append(token)
+
+        if "_" in token:
+            tokens.extend(part for part in token.split("_") if part)
+
+    return tokens
+
+
+def singular(token: str) -> str:
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+class TextIndex:
+    def __init__(self):
+        self._docs: Dict[Hashable, Counter] = {}
+        self._dirty = True
+        self._keys: List[Hashable] = []
+        self._vocab: Dict[str, int] = {}
+        self._idf = None
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, key: Hashable, text: str):
+        self._docs[key] = Counter(tokenize(text))
+        self._dirty = True
+
+    def remove(self, key: Hashable):
+        if self._docs.pop(key, None) is not None:
+            self._dirty = True
+
+    def _rebuild(self):
+        self._keys = list(self._docs)
+        doc_freq: Counter = Counter()
+
+        for counts in self._docs.values():
+            doc_freq.update(counts.keys())
+
+        self._vocab = {token: i for i, token in enumerate(sorted(doc_freq))}
+        n_docs = len(self._keys)
+
+        idf = [0.0] * len(self._vocab)
+        for token, i in self._vocab.items():
+            idf[i] = math.log((1 + n_docs) / (1 + doc_freq[token])) + 1
+
+        if np is None:
+            self._idf = idf
+            self._matrix = [self._weigh(self._docs[key]) for key in self._keys]
+        else:
+            self._idf = np.asarray(idf, dtype=np.float32)
+            matrix = np.zeros((n_docs, len(self._vocab)), dtype=np.float32)
+
+            for row, key in enumerate(self._keys):
+                for token, count in self._docs[key].items():
+                    matrix[row, self._vocab[token]] = count
+
+            matrix *= self._idf
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._matrix = matrix / norms
+
+        self._dirty = False
+
+    def _weigh(self, counts: Counter) -> Dict[int, float]:
+        vector = {
+            self._vocab[token]: count * self._idf[self._vocab[token]]
+            for token, count in counts.items()
+            if token in self._vocab
+        }
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {i: v / norm for i, v in vector.items()}
+
+    def query(
+        self,
+        text: str,
+        *,
+        top_k: Optional[int] = None,
+        min_score: float = 0.0
+    ) -> List[Tuple[Hashable, float]]:
+        if not self._docs:
+            return []
+
+        if self._dirty:
+            self._rebuild()
+
+        counts = Counter(tokenize(text))
+
+        if np is None:
+            vector = self._weigh(counts)
+            scores = [
+                sum(weight * doc.get(i, 0.0) for i, weight in vector.items())
+                for doc in self._matrix
+            ]
+        else:
+            vector = np.zeros(len(self._vocab), dtype=np.float32)
+            for token, count in counts.items():
+                i = self._vocab.get(token)
+                if i is not None:
+                    vector[i] = count * self._idf[i]
+
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return []
+
+            scores = (self._matrix @ (vector / norm)).tolist()
+
+        ranked = sorted(
+            (
+                (key, float(score))
+                for key, score in zip(self._keys, scores)
+                if score > 0 and score >= min_score
+            ),
+            key=lambda item: item[1],
+            reverse=True
+        )
+
+        return ranked[:top_k] if top_k is not None else ranked
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+
+def _stub_backend() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/mcp/tools/get_schema")
+    async def get_schema():
+        return {"candidates": ["id", "full_name", "email", "city"]}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_stub(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(_stub_backend(), host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Stub backend did not start")
+        time.sleep(0.05)
+
+    return server
+
+
+def _summary(samples: List[float], elapsed: float) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "calls": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 3),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+    }
+
+
+async def _measure(
+    call: Callable[[], Awaitable[None]],
+    *,
+    calls: int,
+    concurrency: int
+) -> Dict[str, float]:
+    samples: List[float] = []
+    remaining = calls
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return _summary(samples, time.perf_counter() - started)
+
+
+async def run(args) -> None:
+    from app.mcp_client import MCPClient
+
+    url = f"{args.base_url.rstrip('/')}/mcp/tools/get_schema"
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    async def per_call_client():
+        async with httpx.AsyncClient(timeout=30) as client:
+            (await client.get(url, headers=headers)).raise_for_status()
+
+    pooled = MCPClient()
+    await pooled.start()
+
+    async def pooled_client():
+        await pooled.call_tool(tool_name="get_schema", jwt_token=args.token, arguments={})
+
+    try:
+        for _ in range(args.warmup):
+            await per_call_client()
+            await pooled_client()
+
+        for concurrency in args.concurrency:
+            before = await _measure(per_call_client, calls=args.calls, concurrency=concurrency)
+            after = await _measure(pooled_client, calls=args.calls, concurrency=concurrency)
+
+            print(f"\nconcurrency={concurrency}")
+            print(f"  {'client':<16}{'mean':>10}{'p50':>10}{'p95':>10}{'req/s':>10}")
+            for name, result in (("per-call", before), ("pooled", after)):
+                print(
+                    f"  {name:<16}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['throughput_rps']:>10.1f}"
+                )
+    finally:
+        await pooled.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-call and pooled httpx clients for MCP tool calls"
+    )
+    parser.add_argument(
+        "--base-url",
+        help="Real MCP server to call; defaults to an in-process stub backend"
+    )
+    parser.add_argument("--token", default="bench", help="Bearer token for --base-url")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    if not args.base_url:
+        args.base_url = f"http://127.0.0.1:{_free_port()}"
+        _start_stub(int(args.base_url.rsplit(":", 1)[1]))
+
+    os.environ["MCP_BASE_URL"] = args.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
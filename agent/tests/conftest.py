@@ -0,0 +1,7 @@
+import os
+import sys
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("MCP_BASE_URL", "http://localhost:8000")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+from app.plan_cache import PlanCache
+from app.schemas import Plan, PlannedAction
+
+
+def _plan(sql: str) -> Plan:
+    return Plan(
+        intent="db",
+        actions=[PlannedAction(tool="run_read_query", sql=sql, reason="test")]
+    )
+
+
+def _cache() -> PlanCache:
+    return PlanCache(ttl_seconds=600, max_entries=100, similarity_threshold=0.5)
+
+
+def test_swapped_values_do_not_near_hit():
+    cache = _cache()
+    cache.put(
+        "show interviews for candidate 3 with interviewer 5",
+        "ctx",
+        _plan("SELECT * FROM interviews WHERE candidate_id = 3 AND interviewer_id = 5")
+    )
+
+    assert cache.get("show interviews for candidate 5 with interviewer 3", "ctx") is None
+
+
+def test_filler_words_still_near_hit():
+    cache = _cache()
+    plan = _plan("SELECT * FROM interviews WHERE candidate_id = 3 AND interviewer_id = 5")
+    cache.put("show interviews for candidate 3 with interviewer 5", "ctx", plan)
+
+    hit = cache.get("please list all the interviews for candidate 3 with interviewer 5", "ctx")
+
+    assert hit is not None
+    assert hit.actions[0].sql == plan.actions[0].sql
+
+
+def test_write_plans_are_not_cached():
+    cache = _cache()
+    cache.put(
+        "set city to PUNE where id=3",
+        "ctx",
+        Plan(
+            intent="db",
+            actions=[PlannedAction(
+                tool="execute_write_safely",
+                sql="UPDATE candidates SET city = 'PUNE' WHERE id = 3",
+                reason="test"
+            )]
+        )
+    )
+
+    assert cache.get("set city to PUNE where id=3", "ctx") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_literal_case_is_part_of_the_key():
+    cache = _cache()
+    cache.put(
+        "candidates in Pune",
+        "ctx",
+        _plan("SELECT * FROM candidates WHERE city = 'Pune'")
+    )
+
+    assert cache.get("candidates in PUNE", "ctx") is None
+    assert cache.get("candidates in Pune", "ctx") is not None
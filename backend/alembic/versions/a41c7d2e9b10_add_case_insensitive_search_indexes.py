@@ -0,0 +1,72 @@
+"""add case-insensitive search indexes
+
+Revision ID: a41c7d2e9b10
+Revises: 7f0fab7aba67
+Create Date: 2026-03-02 10:14:07.512305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c7d2e9b10'
+down_revision: Union[str, Sequence[str], None] = '7f0fab7aba67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_COLUMNS = [
+    ('candidates', 'full_name'),
+    ('candidates', 'email'),
+    ('candidates', 'city'),
+    ('interviewers', 'full_name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.create_index(
+                f'ix_{table}_{column}_lower',
+                table,
+                [sa.text(f'lower({column})')],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.create_index(
+                f'ix_{table}_{column}_trgm',
+                table,
+                [sa.text(f'lower({column}) gin_trgm_ops')],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+    for table in dict.fromkeys(t for t, _ in SEARCH_COLUMNS):
+        op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.drop_index(
+                f'ix_{table}_{column}_trgm',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+            op.drop_index(
+                f'ix_{table}_{column}_lower',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import get_db, require_admin
+from app.core.profiling import profile_store
+from app.core.metrics import tool_metrics, allocation_tracker
 from app.schemas.user import (
     UserPermissionCreate,
     UserPermissionUpdate,
@@ -193,3 +196,71 @@ def delete_user_permission(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete permission"
         )
+
+
+@router.get(
+    "/profiles",
+    response_model=list[dict]
+)
+def list_profiles(
+    _=Depends(require_admin)
+):
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{request_id}",
+    response_class=PlainTextResponse
+)
+def get_profile(
+    request_id: str,
+    _=Depends(require_admin)
+):
+    profile = profile_store.get(request_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    return PlainTextResponse(profile["collapsed"])
+
+
+@router.get(
+    "/metrics/tools",
+    response_model=dict
+)
+def get_tool_metrics(
+    _=Depends(require_admin)
+):
+    return {
+        "allocation_tracking": allocation_tracker.status(),
+        "tools": tool_metrics.as_dict()
+    }
+
+
+@router.delete(
+    "/metrics/tools",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def reset_tool_metrics(
+    _=Depends(require_admin)
+):
+    tool_metrics.reset()
+    return None
+
+
+@router.put(
+    "/metrics/allocation-tracking",
+    response_model=dict
+)
+def set_allocation_tracking(
+    enabled: bool = Body(..., embed=True),
+    _=Depends(require_admin)
+):
+    if enabled:
+        allocation_tracker.enable()
+    else:
+        allocation_tracker.disable()
+
+    return allocation_tracker.status()
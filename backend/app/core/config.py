@@ -19,6 +19,27 @@ class Settings(BaseSettings):
 
     bcrypt_rounds: int = Field(default=12)
 
+    write_row_ceiling_admin: int = Field(default=10000)
+    write_row_ceiling_user: int = Field(default=100)
+
+    explain_analyze_timeout_ms: int = Field(default=5000)
+
+    index_advisor_scratch_rows: int = Field(default=10000)
+
+    plan_cache_ttl_seconds: int = Field(default=300)
+    plan_cache_max_entries: int = Field(default=512)
+
+    stream_read_batch_size: int = Field(default=500)
+    stream_read_max_rows: int = Field(default=100000)
+
+    profile_sample_interval_ms: float = Field(default=5.0)
+    profile_store_max_entries: int = Field(default=200)
+
+    tool_metrics_window: int = Field(default=1024)
+    allocation_trace_frames: int = Field(default=10)
+    allocation_sample_rate: float = Field(default=0.1)
+    allocation_snapshot_threshold_bytes: int = Field(default=50 * 1024 * 1024)
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": True
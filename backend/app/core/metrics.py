@@ -0,0 +1,231 @@
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.core.config import get_settings
+
+
+_settings = get_settings()
+
+TOP_ALLOCATION_SITES = 10
+SNAPSHOTS_PER_TOOL = 3
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[rank], 3)
+
+
+class _ToolStats:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.tracked_calls = 0
+        self.peak_bytes_total = 0
+        self.peak_bytes_max = 0
+        self.last_peak_bytes: Optional[int] = None
+        self.snapshots: Deque[Dict[str, Any]] = deque(maxlen=SNAPSHOTS_PER_TOOL)
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "max_ms": round(self.max_ms, 3),
+            "memory": {
+                "tracked_calls": self.tracked_calls,
+                "peak_bytes_max": self.peak_bytes_max,
+                "peak_bytes_avg": (
+                    self.peak_bytes_total // self.tracked_calls
+                    if self.tracked_calls else None
+                ),
+                "last_peak_bytes": self.last_peak_bytes,
+                "snapshots": list(self.snapshots),
+            },
+        }
+
+
+class ToolMetrics:
+    def __init__(self, *, window: int):
+        self._window = window
+        self._stats: Dict[str, _ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, tool: str) -> _ToolStats:
+        stats = self._stats.get(tool)
+        if stats is None:
+            stats = self._stats[tool] = _ToolStats(self._window)
+        return stats
+
+    def observe(self, tool: str, duration_ms: float, ok: bool):
+        with self._lock:
+            stats = self._get(tool)
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.latencies.append(duration_ms)
+
+            if not ok:
+                stats.errors += 1
+
+    def observe_memory(
+        self,
+        tool: str,
+        peak_bytes: int,
+        snapshot: Optional[Dict[str, Any]]
+    ):
+        with self._lock:
+            stats = self._get(tool)
+            stats.tracked_calls += 1
+            stats.peak_bytes_total += peak_bytes
+            stats.peak_bytes_max = max(stats.peak_bytes_max, peak_bytes)
+            stats.last_peak_bytes = peak_bytes
+
+            if snapshot is not None:
+                stats.snapshots.append(snapshot)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {tool: stats.as_dict() for tool, stats in sorted(self._stats.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class AllocationTracker:
+    def __init__(self, *, frames: int, snapshot_threshold_bytes: int, sample_rate: float):
+        self._frames = frames
+        self._threshold = snapshot_threshold_bytes
+        self._sample_rate = sample_rate
+        self._state_lock = threading.Lock()
+        self._call_lock = threading.Lock()
+        self.enabled = False
+
+    def enable(self):
+        with self._state_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self._frames)
+            self.enabled = True
+
+    def disable(self):
+        with self._state_lock:
+            self.enabled = False
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "frames": self._frames,
+            "snapshot_threshold_bytes": self._threshold,
+            "sample_rate": self._sample_rate,
+        }
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _top_sites(self) -> List[Dict[str, Any]]:
+        # Sites still holding memory when the call returns; tracemalloc keeps
+        # no per-site record of what made up the peak itself.
+        stats = self._snapshot().statistics("lineno")
+
+        return [
+            {
+                "site": str(stat.traceback[0]),
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:TOP_ALLOCATION_SITES]
+        ]
+
+    async def call(self, tool: str, fn: Callable, *args, **kwargs):
+        if (
+            not self.enabled
+            or random.random() >= self._sample_rate
+            or not tracemalloc.is_tracing()
+        ):
+            return await fn(*args, **kwargs)
+
+        # tracemalloc peaks are process-wide, so only one sampled call is
+        # tracked at a time; calls arriving meanwhile run untracked instead of
+        # waiting. Peaks are approximate while other requests are in flight.
+        if not self._call_lock.acquire(blocking=False):
+            return await fn(*args, **kwargs)
+
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            result = await fn(*args, **kwargs)
+
+            _, peak = tracemalloc.get_traced_memory()
+            peak_bytes = max(peak - baseline, 0)
+
+            snapshot = None
+            if peak_bytes >= self._threshold:
+                snapshot = {
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "peak_bytes": peak_bytes,
+                    "live_sites_at_return": self._top_sites(),
+                }
+
+            tool_metrics.observe_memory(tool, peak_bytes, snapshot)
+
+            return result
+
+        finally:
+            self._call_lock.release()
+
+
+tool_metrics = ToolMetrics(window=_settings.tool_metrics_window)
+
+allocation_tracker = AllocationTracker(
+    frames=_settings.allocation_trace_frames,
+    snapshot_threshold_bytes=_settings.allocation_snapshot_threshold_bytes,
+    sample_rate=_settings.allocation_sample_rate
+)
+
+
+def instrumented_call(tool: str, fn: Callable, *args, **kwargs):
+    started = time.perf_counter()
+    ok = False
+
+    try:
+        result = fn(*args, **kwargs)
+        ok = True
+        return result
+
+    finally:
+        tool_metrics.observe(tool, (time.perf_counter() - started) * 1000, ok)
+
+
+async def instrumented_async_call(tool: str, fn: Callable, *args, **kwargs):
+    started = time.perf_counter()
+    ok = False
+
+    try:
+        result = await fn(*args, **kwargs)
+        ok = True
+        return result
+
+    finally:
+        tool_metrics.observe(tool, (time.perf_counter() - started) * 1000, ok)
@@ -0,0 +1,277 @@
+import contextvars
+import functools
+import inspect
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+
+from app.core.config import get_settings
+from app.core.jwt import decode_access_token, TokenError
+from app.core.metrics import allocation_tracker, instrumented_call, instrumented_async_call
+
+
+_settings = get_settings()
+
+PROFILE_HEADER = b"x-mcp-profile"
+REQUEST_ID_HEADER = b"x-request-id"
+PROFILE_ID_RESPONSE_HEADER = b"x-mcp-profile-id"
+
+
+class ProfileSession:
+    def __init__(self, *, request_id: str, method: str, path: str, user_id: Optional[int]):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.user_id = user_id
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, stack: str):
+        with self._lock:
+            self.stacks[stack] += 1
+
+    def collapsed(self) -> str:
+        with self._lock:
+            return "\n".join(
+                f"{stack} {count}" for stack, count in self.stacks.most_common()
+            )
+
+
+_current_session: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    "mcp_profile_session", default=None
+)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def _collapse(frame) -> str:
+    names: List[str] = []
+
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    def __init__(self, *, interval_ms: float):
+        self._interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._threads: Dict[int, ProfileSession] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, session: ProfileSession, ident: int):
+        with self._lock:
+            self._threads[ident] = session
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="mcp-profiler",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def detach(self, ident: int):
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._threads:
+                    self._thread = None
+                    return
+
+                targets = dict(self._threads)
+
+            frames = sys._current_frames()
+
+            for ident, session in targets.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    session.record(_collapse(frame))
+
+            del frames
+            time.sleep(self._interval)
+
+
+class ProfileStore:
+    def __init__(self, *, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, session: ProfileSession, status_code: Optional[int]):
+        entry = {
+            "request_id": session.request_id,
+            "method": session.method,
+            "path": session.path,
+            "user_id": session.user_id,
+            "status_code": status_code,
+            "started_at": session.started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - session.started) * 1000, 3),
+            "samples": sum(session.stacks.values()),
+            "interval_ms": _settings.profile_sample_interval_ms,
+            "collapsed": session.collapsed(),
+        }
+
+        with self._lock:
+            self._entries[session.request_id] = entry
+            self._entries.move_to_end(session.request_id)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(request_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._entries.values())
+
+        return [
+            {k: v for k, v in entry.items() if k != "collapsed"}
+            for entry in reversed(entries)
+        ]
+
+
+profiler = SamplingProfiler(interval_ms=_settings.profile_sample_interval_ms)
+profile_store = ProfileStore(max_entries=_settings.profile_store_max_entries)
+
+
+def _admin_user_id(headers: Dict[bytes, bytes]) -> Optional[int]:
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+
+    if not authorization.lower().startswith("bearer "):
+        return None
+
+    try:
+        payload = decode_access_token(authorization.split(" ", 1)[1].strip())
+    except TokenError:
+        return None
+
+    if payload.get("role") != "admin":
+        return None
+
+    try:
+        return int(payload["sub"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+
+        if headers.get(PROFILE_HEADER, b"") not in (b"1", b"true"):
+            return await self.app(scope, receive, send)
+
+        user_id = _admin_user_id(headers)
+        if user_id is None:
+            return await self.app(scope, receive, send)
+
+        request_id = (
+            headers.get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64]
+            or uuid.uuid4().hex
+        )
+
+        session = ProfileSession(
+            request_id=request_id,
+            method=scope["method"],
+            path=scope["path"],
+            user_id=user_id
+        )
+        status_code: Optional[int] = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_RESPONSE_HEADER, request_id.encode("latin-1")),
+                    ],
+                }
+
+            await send(message)
+
+        token = _current_session.set(session)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _current_session.reset(token)
+            profile_store.add(session, status_code)
+
+
+def _profiled(endpoint: Callable, tool: str) -> Callable:
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            session = _current_session.get()
+            if session is None:
+                return await instrumented_async_call(tool, endpoint, *args, **kwargs)
+
+            ident = threading.get_ident()
+            profiler.attach(session, ident)
+            try:
+                return await instrumented_async_call(tool, endpoint, *args, **kwargs)
+            finally:
+                profiler.detach(ident)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            return instrumented_call(tool, endpoint, *args, **kwargs)
+
+        ident = threading.get_ident()
+        profiler.attach(session, ident)
+        try:
+            return instrumented_call(tool, endpoint, *args, **kwargs)
+        finally:
+            profiler.detach(ident)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        self.tool = path.rstrip("/").rsplit("/", 1)[-1] or path
+        super().__init__(path, _profiled(endpoint, self.tool), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tool = self.tool
+
+        # Wraps the whole route so allocation tracking also covers request
+        # validation and response serialization, not just the endpoint.
+        async def tracked_handler(request):
+            return await allocation_tracker.call(tool, handler, request)
+
+        return tracked_handler
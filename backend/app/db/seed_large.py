@@ -0,0 +1,420 @@
+import argparse
+import csv
+import io
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from sqlalchemy import text
+
+from app.core.logging import setup_logging
+from app.core.security import hash_password
+from app.db.session import engine
+from app.mcp_server.audit import ensure_audit_table
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 50_000
+
+CITIES = [
+    "Delhi", "Bangalore", "Mumbai", "Noida", "Gurgaon", "Pune", "Hyderabad",
+    "Chennai", "Kolkata", "Ahmedabad", "Jaipur", "Lucknow", "Chandigarh",
+    "Indore", "Kochi", "Bhopal", "Nagpur", "Surat", "Patna", "Mysore"
+]
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Rahul", "Rohan", "Karan", "Ishaan",
+    "Ananya", "Diya", "Priya", "Sneha", "Neha", "Pooja", "Riya", "Kavya",
+    "Amit", "Vikram", "Sanjay", "Meera", "Nisha", "Raj", "Tanvi", "Yash"
+]
+
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Patel", "Reddy", "Iyer",
+    "Nair", "Mehta", "Joshi", "Malhotra", "Kapoor", "Chopra", "Das", "Rao",
+    "Bose", "Jain", "Agarwal", "Mishra"
+]
+
+DEPARTMENTS = ["Engineering", "HR", "Product", "Design", "Sales", "Finance"]
+
+TABLE_COLUMNS = {
+    "candidates": ["id", "full_name", "email", "phone", "city", "created_at"],
+    "interviewers": ["id", "full_name", "email", "department", "created_at"],
+    "interviews": [
+        "id", "candidate_id", "interviewer_id", "scheduled_at", "status", "created_at"
+    ]
+}
+
+AUDIT_TEMPLATES = [
+    ("read", "candidates", "SELECT id, full_name, email, city FROM candidates WHERE LOWER(city) = LOWER('{city}') LIMIT 100"),
+    ("read", "candidates", "SELECT id, full_name, email FROM candidates WHERE LOWER(full_name) LIKE LOWER('%{first}%') LIMIT 100"),
+    ("read", "candidates", "SELECT id, full_name, email FROM candidates WHERE LOWER(email) = LOWER('{email}') LIMIT 100"),
+    ("read", "interviews", "SELECT id, candidate_id, scheduled_at, status FROM interviews WHERE status = '{status}' ORDER BY scheduled_at DESC LIMIT 100"),
+    ("read", "interviewers", "SELECT id, full_name, department FROM interviewers WHERE department = '{department}' LIMIT 100"),
+    ("write", "interviews", "UPDATE interviews SET status = '{status}' WHERE id = {id}"),
+    ("write", "candidates", "UPDATE candidates SET city = '{city}' WHERE id = {id}"),
+]
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if not name.strip() or not weight.strip():
+            raise ValueError(f"Invalid weight '{part}', expected name=weight")
+
+        weights[name.strip()] = float(weight)
+
+    if sum(weights.values()) <= 0:
+        raise ValueError("Weights must sum to a positive value")
+
+    return weights
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def _chunks(total: int, size: int) -> List[tuple[int, int]]:
+    return [(start, min(start + size, total + 1)) for start in range(1, total + 1, size)]
+
+
+def _copy_rows(table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+
+    buffer.seek(0)
+
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+    return count
+
+
+def _parallel_copy(
+    *,
+    table: str,
+    columns: Sequence[str],
+    total: int,
+    make_rows: Callable[[int, int], Iterable[Sequence[Any]]],
+    workers: int
+) -> int:
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_copy_rows, table, columns, make_rows(start, end))
+            for start, end in _chunks(total, CHUNK_SIZE)
+        ]
+        loaded = sum(f.result() for f in futures)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Loaded %s rows into %s in %.1fs (%.0f rows/s)",
+        loaded, table, elapsed, loaded / elapsed if elapsed else 0
+    )
+
+    return loaded
+
+
+def _full_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _timestamp(rng: random.Random, start: datetime, span_seconds: int) -> str:
+    return (start + timedelta(seconds=rng.randint(0, span_seconds))).isoformat()
+
+
+def _permission_rows(
+    rng: random.Random,
+    user_id: int,
+    role: str
+) -> List[List[Any]]:
+    rows = []
+
+    for table, columns in TABLE_COLUMNS.items():
+        if role == "admin":
+            rows.append([user_id, table, True, True, None])
+            continue
+
+        if rng.random() < 0.2:
+            continue
+
+        can_read = rng.random() < 0.9
+        can_write = rng.random() < 0.15
+
+        if rng.random() < 0.3:
+            allowed = None
+        else:
+            allowed = ["id"] + rng.sample(columns[1:], rng.randint(1, len(columns) - 1))
+
+        rows.append([
+            user_id,
+            table,
+            can_read,
+            can_write,
+            json.dumps(allowed) if allowed is not None else None
+        ])
+
+    return rows
+
+
+def seed_large(
+    *,
+    candidates: int,
+    interviewers: int,
+    interviews: int,
+    users: int,
+    audit_logs: int,
+    admin_ratio: float,
+    city_skew: float,
+    status_mix: Dict[str, float],
+    days_back: int,
+    days_ahead: int,
+    workers: int,
+    seed: int
+) -> Dict[str, int]:
+    if candidates < 1 or interviewers < 1 or users < 2:
+        raise ValueError("At least 1 candidate, 1 interviewer and 2 users are required")
+
+    now = datetime.now(timezone.utc)
+    range_start = now - timedelta(days=days_back)
+    span = int(timedelta(days=days_back + days_ahead).total_seconds())
+    history_span = int(timedelta(days=days_back).total_seconds())
+
+    city_weights = zipf_weights(len(CITIES), city_skew)
+    statuses = list(status_mix)
+    status_weights = list(status_mix.values())
+
+    default_password_hash = hash_password("User@1234")
+    admin_password_hash = hash_password("Admin@1234")
+
+    ensure_audit_table(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "TRUNCATE interviews, user_permissions, candidates, interviewers, "
+            "users, mcp_audit_logs RESTART IDENTITY CASCADE"
+        ))
+
+    def role_for(user_id: int) -> str:
+        if user_id == 1:
+            return "admin"
+        if user_id == 2:
+            return "user"
+
+        return "admin" if random.Random(seed * 1_000_003 + user_id).random() < admin_ratio else "user"
+
+    def user_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_003 + start)
+        for user_id in range(start, end):
+            if user_id == 1:
+                yield [1, "admin@example.com", admin_password_hash, "admin", now.isoformat()]
+            elif user_id == 2:
+                yield [2, "user@example.com", default_password_hash, "user", now.isoformat()]
+            else:
+                role = role_for(user_id)
+                yield [
+                    user_id,
+                    f"user{user_id}@example.com",
+                    admin_password_hash if role == "admin" else default_password_hash,
+                    role,
+                    _timestamp(rng, range_start, history_span)
+                ]
+
+    def candidate_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_033 + start)
+        for candidate_id in range(start, end):
+            yield [
+                candidate_id,
+                _full_name(rng),
+                f"candidate{candidate_id}@example.com",
+                f"9{rng.randint(0, 999_999_999):09d}",
+                rng.choices(CITIES, weights=city_weights)[0],
+                _timestamp(rng, range_start, history_span)
+            ]
+
+    def interviewer_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_037 + start)
+        for interviewer_id in range(start, end):
+            yield [
+                interviewer_id,
+                _full_name(rng),
+                f"interviewer{interviewer_id}@example.com",
+                rng.choice(DEPARTMENTS),
+                _timestamp(rng, range_start, history_span)
+            ]
+
+    def interview_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_039 + start)
+        for interview_id in range(start, end):
+            yield [
+                interview_id,
+                rng.randint(1, candidates),
+                rng.randint(1, interviewers),
+                _timestamp(rng, range_start, span),
+                rng.choices(statuses, weights=status_weights)[0],
+                _timestamp(rng, range_start, history_span)
+            ]
+
+    def audit_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_081 + start)
+        for _ in range(start, end):
+            operation, table, template = rng.choice(AUDIT_TEMPLATES)
+            first = rng.choice(FIRST_NAMES)
+            yield [
+                rng.randint(1, users),
+                operation,
+                table,
+                template.format(
+                    city=rng.choices(CITIES, weights=city_weights)[0],
+                    first=first.lower(),
+                    email=f"candidate{rng.randint(1, candidates)}@example.com",
+                    status=rng.choices(statuses, weights=status_weights)[0],
+                    department=rng.choice(DEPARTMENTS),
+                    id=rng.randint(1, max(candidates, interviews, 1))
+                ),
+                "success" if rng.random() < 0.95 else "failed",
+                _timestamp(rng, range_start, history_span)
+            ]
+
+    def permission_rows(start: int, end: int):
+        rng = random.Random(seed * 1_000_099 + start)
+        for user_id in range(start, end):
+            if user_id == 2:
+                yield [2, "candidates", True, False, json.dumps(["id", "full_name", "email", "city"])]
+                yield [2, "interviews", True, False, json.dumps(
+                    ["id", "candidate_id", "interviewer_id", "scheduled_at", "status"]
+                )]
+                continue
+
+            yield from _permission_rows(rng, user_id, role_for(user_id))
+
+    loaded: Dict[str, int] = {}
+
+    loaded["users"] = _parallel_copy(
+        table="users",
+        columns=["id", "email", "password_hash", "role", "created_at"],
+        total=users,
+        make_rows=user_rows,
+        workers=workers
+    )
+    loaded["candidates"] = _parallel_copy(
+        table="candidates",
+        columns=TABLE_COLUMNS["candidates"],
+        total=candidates,
+        make_rows=candidate_rows,
+        workers=workers
+    )
+    loaded["interviewers"] = _parallel_copy(
+        table="interviewers",
+        columns=TABLE_COLUMNS["interviewers"],
+        total=interviewers,
+        make_rows=interviewer_rows,
+        workers=workers
+    )
+    loaded["interviews"] = _parallel_copy(
+        table="interviews",
+        columns=TABLE_COLUMNS["interviews"],
+        total=interviews,
+        make_rows=interview_rows,
+        workers=workers
+    )
+    loaded["user_permissions"] = _parallel_copy(
+        table="user_permissions",
+        columns=["user_id", "table_name", "can_read", "can_write", "allowed_columns"],
+        total=users,
+        make_rows=permission_rows,
+        workers=workers
+    )
+    loaded["mcp_audit_logs"] = _parallel_copy(
+        table="mcp_audit_logs",
+        columns=["user_id", "operation", "table_name", "sql_text", "status", "created_at"],
+        total=audit_logs,
+        make_rows=audit_rows,
+        workers=workers
+    )
+
+    with engine.begin() as conn:
+        for table in ("users", "candidates", "interviewers", "interviews"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+            ))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            "ANALYZE users, user_permissions, candidates, interviewers, "
+            "interviews, mcp_audit_logs"
+        ))
+
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load a large synthetic dataset for benchmarking"
+    )
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--interviewers", type=int, default=5_000)
+    parser.add_argument("--interviews", type=int, default=3_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--audit-logs", type=int, default=1_000_000)
+    parser.add_argument("--admin-ratio", type=float, default=0.05)
+    parser.add_argument(
+        "--city-skew",
+        type=float,
+        default=1.1,
+        help="Zipf exponent for the city distribution (0 = uniform)"
+    )
+    parser.add_argument(
+        "--status-mix",
+        default="scheduled=0.3,completed=0.6,cancelled=0.1",
+        help="Interview status weights as name=weight pairs"
+    )
+    parser.add_argument("--days-back", type=int, default=365)
+    parser.add_argument("--days-ahead", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_logging()
+
+    loaded = seed_large(
+        candidates=args.candidates,
+        interviewers=args.interviewers,
+        interviews=args.interviews,
+        users=args.users,
+        audit_logs=args.audit_logs,
+        admin_ratio=args.admin_ratio,
+        city_skew=args.city_skew,
+        status_mix=parse_weights(args.status_mix),
+        days_back=args.days_back,
+        days_ahead=args.days_ahead,
+        workers=args.workers,
+        seed=args.seed
+    )
+
+    logger.info("Seeding complete: %s", loaded)
+
+
+if __name__ == "__main__":
+    main()
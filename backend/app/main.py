@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth, admin
 from app.mcp_server.server import mcp_router
 from app.core.logging import setup_logging
+from app.core.profiling import ProfilingMiddleware
 
 setup_logging()
 
@@ -20,6 +21,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+
 app.include_router(auth.router, prefix="/auth")
 app.include_router(admin.router, prefix="/admin")
 app.include_router(mcp_router, prefix="/mcp")
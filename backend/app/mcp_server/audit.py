@@ -72,6 +72,19 @@ def log_audit(
         )
 
 
+def _format_audit_row(r) -> Dict[str, Any]:
+    row = dict(r)
+
+    if row.get("created_at"):
+        row["created_at"] = (
+            row["created_at"]
+            .astimezone(timezone.utc)
+            .isoformat()
+        )
+
+    return row
+
+
 def fetch_audit_history(
     *,
     db: Session,
@@ -113,22 +126,35 @@ def fetch_audit_history(
         result = db.execute(stmt)
         rows = result.mappings().all()
 
-        data: List[Dict[str, Any]] = []
+        return [_format_audit_row(r) for r in rows]
 
-        for r in rows:
-            row = dict(r)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load audit history"
+        )
 
-           
-            if row.get("created_at"):
-                row["created_at"] = (
-                    row["created_at"]
-                    .astimezone(timezone.utc)
-                    .isoformat()
-                )
 
-            data.append(row)
+def fetch_audit_sql(
+    *,
+    db: Session,
+    operation: str = "read",
+    status_filter: str = "success",
+    limit: int = 2000
+) -> List[Dict[str, Any]]:
+    try:
+        stmt = (
+            select(
+                _audit_table.c.table_name,
+                _audit_table.c.sql_text
+            )
+            .where(_audit_table.c.operation == operation)
+            .where(_audit_table.c.status == status_filter)
+            .order_by(_audit_table.c.id.desc())
+            .limit(limit)
+        )
 
-        return data
+        return [dict(r) for r in db.execute(stmt).mappings().all()]
 
     except Exception:
         raise HTTPException(
@@ -0,0 +1,128 @@
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.mcp_server.validator import QueryValidationResult
+
+
+EXACT_COUNT_MAX_ROWS = 100_000
+EXACT_COUNT_MAX_BYTES = 64 * 1024 * 1024
+
+_settings = get_settings()
+
+
+def _is_small_table(db: Session, table: str) -> bool:
+    row = db.execute(
+        text(
+            "SELECT reltuples::bigint, pg_relation_size(oid) "
+            "FROM pg_class WHERE oid = to_regclass(:table)"
+        ),
+        {"table": table}
+    ).fetchone()
+
+    if not row:
+        return False
+
+    reltuples, size = row
+
+    if reltuples is not None and reltuples >= 0:
+        return reltuples <= EXACT_COUNT_MAX_ROWS
+
+    return size <= EXACT_COUNT_MAX_BYTES
+
+
+def _exact_count(db: Session, sql: str) -> int:
+    # The validated statement itself runs and is rolled back, so the count
+    # covers exactly the rows it would touch.
+    savepoint = db.begin_nested()
+    try:
+        db.execute(text(f"SET LOCAL statement_timeout = {int(_settings.explain_analyze_timeout_ms)}"))
+        return db.execute(text(sql)).rowcount
+    finally:
+        savepoint.rollback()
+
+
+def _planner_estimate(db: Session, sql: str) -> Optional[int]:
+    result = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).fetchone()
+
+    if not result or not result[0]:
+        return None
+
+    plan = result[0][0].get("Plan", {})
+
+    if plan.get("Node Type") == "ModifyTable" and plan.get("Plans"):
+        plan = plan["Plans"][0]
+
+    rows = plan.get("Plan Rows")
+    return int(rows) if rows is not None else None
+
+
+def row_ceiling_for_role(role: str | None) -> int:
+    if role == "admin":
+        return _settings.write_row_ceiling_admin
+
+    return _settings.write_row_ceiling_user
+
+
+def estimate_affected_rows(
+    *,
+    db: Session,
+    sql: str,
+    validation: QueryValidationResult
+) -> Optional[Dict[str, Any]]:
+    first = sql.strip().split()[0].lower()
+
+    if first not in {"update", "delete"}:
+        return None
+
+    if _is_small_table(db, validation.table):
+        try:
+            return {"rows": _exact_count(db, validation.sql), "method": "exact"}
+        except Exception:
+            pass
+
+    return {"rows": _planner_estimate(db, validation.sql), "method": "estimate"}
+
+
+def check_row_ceiling(
+    affected: Optional[Dict[str, Any]],
+    role: str | None
+) -> Optional[str]:
+    if not affected or affected.get("rows") is None:
+        return None
+
+    ceiling = row_ceiling_for_role(role)
+
+    if affected["rows"] <= ceiling:
+        return None
+
+    return (
+        f"Statement would affect about {affected['rows']} rows, above the "
+        f"{ceiling}-row limit for role '{role}'. Resend with confirm=true to proceed."
+    )
+
+
+def enforce_row_ceiling(
+    *,
+    db: Session,
+    sql: str,
+    validation: QueryValidationResult,
+    role: str | None,
+    confirm: bool
+):
+    if confirm:
+        return
+
+    problem = check_row_ceiling(
+        estimate_affected_rows(db=db, sql=sql, validation=validation),
+        role
+    )
+
+    if problem:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=problem
+        )
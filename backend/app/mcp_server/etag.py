@@ -0,0 +1,38 @@
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def compute_etag(payload: Any) -> str:
+    body = json.dumps(
+        jsonable_encoder(payload),
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = {
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    }
+
+    return "*" in candidates or etag in candidates
+
+
+def etag_response(payload: Any, if_none_match: str | None) -> Response:
+    etag = compute_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return JSONResponse(content=jsonable_encoder(payload), headers=headers)
@@ -1,14 +1,17 @@
-from typing import Any, List, Dict
+from typing import Any, Dict, Iterator, List
 import re
 
 from fastapi import HTTPException, status
-from sqlalchemy import text
+from sqlalchemy import text, table as sa_table, column as sa_column
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app.mcp_server.validator import QueryValidationResult
 
 
+BULK_INSERT_BATCH_SIZE = 1000
+
+
 def _rewrite_select_columns(sql: str, columns: List[str]) -> str:
     select_part = ", ".join(columns)
 
@@ -27,6 +30,54 @@ def _rewrite_select_columns(sql: str, columns: List[str]) -> str:
     )
 
 
+def _apply_read_limit(sql: str, limit: int) -> str:
+    if re.search(r"\blimit\b", sql, re.IGNORECASE):
+        return re.sub(
+            r"\blimit\s+\d+",
+            f"LIMIT {limit}",
+            sql,
+            flags=re.IGNORECASE
+        )
+
+    return f"{sql} LIMIT {limit}"
+
+
+def _rewrite_returning(sql: str, columns: List[str]) -> str:
+    returning_part = ", ".join(columns)
+
+    pattern = re.compile(
+        r"\breturning\s+[\w\*,\s]+$",
+        re.IGNORECASE
+    )
+
+    base = sql.strip().rstrip(";")
+
+    if pattern.search(base):
+        return pattern.sub(f"RETURNING {returning_part}", base, count=1)
+
+    return f"{base} RETURNING {returning_part}"
+
+
+def _build_read_sql(validation: QueryValidationResult, limit: int) -> str:
+    base_sql = validation.sql.strip().rstrip(";")
+    upper = base_sql.upper()
+
+    is_aggregation = any(
+        fn in upper for fn in ("COUNT(", "SUM(", "AVG(", "MIN(", "MAX("))
+    
+
+    if not is_aggregation and validation.columns:
+        base_sql = _rewrite_select_columns(
+            base_sql,
+            validation.columns
+        )
+
+    if not is_aggregation:
+        base_sql = _apply_read_limit(base_sql, limit)
+
+    return base_sql
+
+
 def run_read(
     *,
     db: Session,
@@ -35,33 +86,10 @@ def run_read(
     validation: QueryValidationResult
 ) -> List[Dict[str, Any]]:
     try:
-        base_sql = validation.sql.strip().rstrip(";")
-        upper = base_sql.upper()
-
-        is_aggregation = any(
-            fn in upper for fn in ("COUNT(", "SUM(", "AVG(", "MIN(", "MAX("))
-        
-
-        if not is_aggregation and validation.columns:
-            base_sql = _rewrite_select_columns(
-                base_sql,
-                validation.columns
-            )
-
-        if not is_aggregation:
-            if re.search(r"\blimit\b", base_sql, re.IGNORECASE):
-                base_sql = re.sub(
-                    r"\blimit\s+\d+",
-                    f"LIMIT {validation.limit}",
-                    base_sql,
-                    flags=re.IGNORECASE
-                )
-            else:
-                base_sql = f"{base_sql} LIMIT {validation.limit}"
+        base_sql = _build_read_sql(validation, validation.limit)
 
         result = db.execute(text(base_sql))
-        rows = result.mappings().all()
-        return [dict(row) for row in rows]
+        return [dict(row) for row in result.mappings()]
 
     except Exception as e:
         raise HTTPException(
@@ -70,6 +98,27 @@ def run_read(
         )
 
 
+def stream_read(
+    *,
+    engine: Engine,
+    validation: QueryValidationResult,
+    batch_size: int,
+    max_rows: int
+) -> Iterator[List[Dict[str, Any]]]:
+    limit = min(validation.requested_limit or max_rows, max_rows)
+    base_sql = _build_read_sql(validation, limit)
+
+    # A server-side cursor keeps memory flat no matter how many rows match.
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True,
+            max_row_buffer=batch_size
+        ).execute(text(base_sql))
+
+        for partition in result.mappings().partitions(batch_size):
+            yield [dict(row) for row in partition]
+
+
 def run_write(
     *,
     db: Session,
@@ -78,6 +127,38 @@ def run_write(
     validation: QueryValidationResult
 ) -> Dict[str, Any]:
     try:
+        if validation.upsert:
+            # xmax is 0 only for freshly inserted tuples, which separates
+            # inserted rows from ones updated by ON CONFLICT DO UPDATE.
+            upsert_sql = _rewrite_returning(
+                validation.sql,
+                (validation.returning or []) + ["(xmax = 0) AS _inserted"]
+            )
+            result = db.execute(text(upsert_sql))
+            rows = [dict(row) for row in result.mappings().all()]
+
+            inserted = sum(1 for row in rows if row.pop("_inserted"))
+
+            response: Dict[str, Any] = {
+                "rows_affected": len(rows),
+                "inserted": inserted,
+                "updated": len(rows) - inserted
+            }
+
+            if validation.returning:
+                response["rows"] = rows
+
+            return response
+
+        if validation.returning:
+            returning_sql = _rewrite_returning(
+                validation.sql,
+                validation.returning
+            )
+            result = db.execute(text(returning_sql))
+            rows = [dict(row) for row in result.mappings().all()]
+            return {"rows_affected": len(rows), "rows": rows}
+
         result = db.execute(text(validation.sql))
         return {"rows_affected": result.rowcount}
 
@@ -85,4 +166,37 @@ def run_write(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
+        ) from e
+
+
+def run_bulk_insert(
+    *,
+    db: Session,
+    engine: Engine,
+    table: str,
+    columns: List[str],
+    rows: List[List[Any]]
+) -> Dict[str, Any]:
+    try:
+        target = sa_table(table, *[sa_column(c) for c in columns])
+        stmt = target.insert()
+
+        inserted = 0
+        batches = 0
+
+        for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            batch = [
+                dict(zip(columns, row))
+                for row in rows[start:start + BULK_INSERT_BATCH_SIZE]
+            ]
+            db.execute(stmt, batch)
+            inserted += len(batch)
+            batches += 1
+
+        return {"rows_inserted": inserted, "batches": batches}
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from e
@@ -0,0 +1,323 @@
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def _mask_literals(sql: str) -> str:
+    return re.sub(r"'(?:[^']|'')*'", "?", sql)
+
+
+def query_shape(sql: str) -> str:
+    shape = _mask_literals(sql.strip().rstrip(";"))
+    shape = re.sub(r"\b\d+(?:\.\d+)?\b", "?", shape)
+    return " ".join(shape.lower().split())
+
+
+def _strip_alias(column: str) -> str:
+    return column.split(".")[-1]
+
+
+def _where_clause(shape: str) -> str:
+    match = re.search(
+        r"\bwhere\s+(.+?)(?:\s+order\s+by\b|\s+limit\b|$)",
+        shape
+    )
+    return match.group(1) if match else ""
+
+
+def _order_by(shape: str) -> Optional[tuple[str, str]]:
+    match = re.search(r"\border\s+by\s+([\w\.]+)(?:\s+(asc|desc))?", shape)
+    if not match:
+        return None
+
+    return _strip_alias(match.group(1)), (match.group(2) or "asc")
+
+
+def _index_name(table: str, columns: List[str], suffix: str) -> str:
+    return f"ix_{table}_{'_'.join(columns)}_{suffix}"[:63]
+
+
+def candidate_indexes(shape: str, table: str) -> List[Dict[str, Any]]:
+    where = _where_clause(shape)
+    candidates: List[Dict[str, Any]] = []
+
+    for col in re.findall(r"lower\(\s*([\w\.]+)\s*\)\s*(?:not\s+)?like\b", where):
+        col = _strip_alias(col)
+        candidates.append({
+            "kind": "trigram",
+            "columns": [col],
+            "method": "gin",
+            "keys": f"lower({col}) gin_trgm_ops",
+            "name": _index_name(table, [col], "trgm"),
+            "requires_extension": "pg_trgm"
+        })
+
+    for col in re.findall(r"([\w\.]+)\s+ilike\b", where):
+        col = _strip_alias(col)
+        candidates.append({
+            "kind": "trigram",
+            "columns": [col],
+            "method": "gin",
+            "keys": f"{col} gin_trgm_ops",
+            "name": _index_name(table, [col], "trgm"),
+            "requires_extension": "pg_trgm"
+        })
+
+    for col in re.findall(r"lower\(\s*([\w\.]+)\s*\)\s*=", where):
+        col = _strip_alias(col)
+        candidates.append({
+            "kind": "expression",
+            "columns": [col],
+            "method": "btree",
+            "keys": f"lower({col})",
+            "name": _index_name(table, [col], "lower"),
+            "requires_extension": None
+        })
+
+    equality = [
+        _strip_alias(c)
+        for c in re.findall(r"(?<![\w\(])([\w\.]+)\s*=\s*\?", where)
+    ]
+    equality = list(dict.fromkeys(equality))
+
+    order = _order_by(shape)
+
+    if order:
+        order_col, direction = order
+        columns = [c for c in equality if c != order_col] + [order_col]
+        keys = ", ".join(columns[:-1] + [f"{order_col} {direction.upper()}"])
+
+        candidates.append({
+            "kind": "composite" if len(columns) > 1 else "btree",
+            "columns": columns,
+            "method": "btree",
+            "keys": keys,
+            "name": _index_name(table, columns, direction),
+            "requires_extension": None
+        })
+
+    elif len(equality) > 1:
+        candidates.append({
+            "kind": "composite",
+            "columns": equality,
+            "method": "btree",
+            "keys": ", ".join(equality),
+            "name": _index_name(table, equality, "eq"),
+            "requires_extension": None
+        })
+
+    return candidates
+
+
+def _normalize_keys(keys: str) -> str:
+    keys = re.sub(r"::\w+", "", keys.lower())
+    keys = re.sub(r"\s+(asc|desc)\b", "", keys)
+    return re.sub(r"[\s\(\)]", "", keys)
+
+
+def existing_index_signatures(db: Session, table: str) -> set[str]:
+    rows = db.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE tablename = :table"),
+        {"table": table}
+    ).fetchall()
+
+    signatures = set()
+
+    for (indexdef,) in rows:
+        match = re.search(r"using\s+(\w+)\s+\((.*)\)", indexdef, re.IGNORECASE)
+        if match:
+            signatures.add(
+                f"{match.group(1).lower()}:{_normalize_keys(match.group(2))}"
+            )
+
+    return signatures
+
+
+def candidate_signature(candidate: Dict[str, Any]) -> str:
+    return f"{candidate['method']}:{_normalize_keys(candidate['keys'])}"
+
+
+def candidate_ddl(candidate: Dict[str, Any], table: str, concurrently: bool) -> str:
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"{candidate['name']} ON {table} "
+        f"USING {candidate['method']} ({candidate['keys']})"
+    )
+
+
+def _explain_cost(db: Session, sql: str) -> Optional[float]:
+    try:
+        with db.begin_nested():
+            result = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).fetchone()
+    except Exception:
+        return None
+
+    if not result or not result[0]:
+        return None
+
+    return result[0][0].get("Plan", {}).get("Total Cost")
+
+
+def _installed_extensions(db: Session) -> set[str]:
+    rows = db.execute(text("SELECT extname FROM pg_extension")).fetchall()
+    return {r[0] for r in rows}
+
+
+def _cost_with_hypothetical_index(
+    db: Session,
+    sql: str,
+    ddl: str
+) -> Optional[float]:
+    try:
+        with db.begin_nested():
+            db.execute(text("SELECT * FROM hypopg_create_index(:ddl)"), {"ddl": ddl})
+            return _explain_cost(db, sql)
+    except Exception:
+        return None
+    finally:
+        # Hypothetical indexes live for the whole session, not the savepoint.
+        try:
+            db.execute(text("SELECT hypopg_reset()"))
+        except Exception:
+            pass
+
+
+def _costs_with_scratch_index(
+    db: Session,
+    sql: str,
+    table: str,
+    ddl: str,
+    sample_rows: int
+) -> tuple[Optional[float], Optional[float]]:
+    if not re.fullmatch(r"\w+", table):
+        return None, None
+
+    # The index is built on a sampled temporary copy, never the live table.
+    # Temporary tables shadow the real one for unqualified names, so both the
+    # DDL and the sample query resolve to the copy unchanged.
+    savepoint = db.begin_nested()
+    try:
+        db.execute(text(
+            f"CREATE TEMP TABLE {table} ON COMMIT DROP AS "
+            f"SELECT * FROM {table} LIMIT {int(sample_rows)}"
+        ))
+        db.execute(text(f"ANALYZE {table}"))
+        cost_before = _explain_cost(db, sql)
+
+        db.execute(text(ddl))
+        db.execute(text(f"ANALYZE {table}"))
+        return cost_before, _explain_cost(db, sql)
+
+    except Exception:
+        return None, None
+
+    finally:
+        savepoint.rollback()
+
+
+def recommend(
+    *,
+    db: Session,
+    samples: List[Dict[str, Any]],
+    top: int,
+    scratch: bool,
+    scratch_rows: int
+) -> Dict[str, Any]:
+    shapes: Counter = Counter()
+    representative: Dict[str, Dict[str, Any]] = {}
+
+    for sample in samples:
+        shape = query_shape(sample["sql_text"])
+        shapes[shape] += 1
+        representative.setdefault(shape, sample)
+
+    extensions = _installed_extensions(db)
+    hypopg = "hypopg" in extensions
+
+    existing_by_table: Dict[str, set[str]] = {}
+    proposals: Dict[str, Dict[str, Any]] = {}
+
+    for shape, occurrences in shapes.most_common(top):
+        sample = representative[shape]
+        table = sample["table_name"]
+        sql = sample["sql_text"]
+
+        if table not in existing_by_table:
+            existing_by_table[table] = existing_index_signatures(db, table)
+
+        for candidate in candidate_indexes(shape, table):
+            signature = candidate_signature(candidate)
+
+            if signature in existing_by_table[table]:
+                continue
+
+            key = f"{table}:{signature}"
+
+            if key in proposals:
+                proposals[key]["occurrences"] += occurrences
+                continue
+
+            ddl = candidate_ddl(candidate, table, concurrently=False)
+            cost_before = _explain_cost(db, sql)
+            cost_after = None
+            method = "none"
+
+            if hypopg and candidate["method"] == "btree":
+                cost_after = _cost_with_hypothetical_index(db, sql, ddl)
+                method = "hypopg"
+            elif scratch:
+                method = "scratch"
+
+                # Extensions are an operator decision; only use installed ones.
+                extension = candidate["requires_extension"]
+                if extension is None or extension in extensions:
+                    sample_before, cost_after = _costs_with_scratch_index(
+                        db, sql, table, ddl, scratch_rows
+                    )
+
+                    # Compare like with like: both costs come from the sample.
+                    if sample_before is not None and cost_after is not None:
+                        cost_before = sample_before
+                    else:
+                        cost_after = None
+
+            if method != "none" and cost_after is None:
+                method = "unavailable"
+
+            reduction = None
+            if cost_before and cost_after is not None:
+                reduction = round((cost_before - cost_after) / cost_before * 100, 2)
+
+            proposals[key] = {
+                "table": table,
+                "kind": candidate["kind"],
+                "columns": candidate["columns"],
+                "ddl": candidate_ddl(candidate, table, concurrently=True),
+                "requires_extension": candidate["requires_extension"],
+                "query_shape": shape,
+                "sample_sql": sql,
+                "occurrences": occurrences,
+                "cost_before": cost_before,
+                "cost_after": cost_after,
+                "estimated_reduction_pct": reduction,
+                "estimation_method": method
+            }
+
+    ranked = sorted(
+        proposals.values(),
+        key=lambda p: (
+            p["occurrences"] * (p["estimated_reduction_pct"] or 0),
+            p["occurrences"]
+        ),
+        reverse=True
+    )
+
+    return {
+        "samples_analyzed": len(samples),
+        "distinct_shapes": len(shapes),
+        "hypopg_available": hypopg,
+        "recommendations": ranked
+    }
@@ -0,0 +1,272 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+
+_settings = get_settings()
+
+SEQ_SCAN_LARGE_ROWS = 10_000
+NESTED_LOOP_MAX_ROWS = 10_000
+NESTED_LOOP_MAX_OUTER_ROWS = 1_000
+
+
+class PlanCache:
+    def __init__(self, *, ttl_seconds: int, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+plan_cache = PlanCache(
+    ttl_seconds=_settings.plan_cache_ttl_seconds,
+    max_entries=_settings.plan_cache_max_entries
+)
+
+
+def query_fingerprint(sql: str) -> str:
+    normalized = " ".join(sql.split()).rstrip(";").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def walk_plan(node: Dict[str, Any], depth: int = 0) -> Iterator[Dict[str, Any]]:
+    yield {"node": node, "depth": depth}
+
+    for child in node.get("Plans", []) or []:
+        yield from walk_plan(child, depth + 1)
+
+
+def _analyzed_node(node: Dict[str, Any], depth: int) -> Dict[str, Any]:
+    loops = node.get("Actual Loops") or 1
+
+    return {
+        "depth": depth,
+        "node_type": node.get("Node Type"),
+        "relation": node.get("Relation Name"),
+        "index": node.get("Index Name"),
+        "estimated_rows": node.get("Plan Rows"),
+        "actual_rows": (node.get("Actual Rows") or 0) * loops,
+        "loops": loops,
+        "actual_startup_time_ms": node.get("Actual Startup Time"),
+        "actual_total_time_ms": node.get("Actual Total Time"),
+        "shared_hit_blocks": node.get("Shared Hit Blocks"),
+        "shared_read_blocks": node.get("Shared Read Blocks"),
+        "temp_written_blocks": node.get("Temp Written Blocks")
+    }
+
+
+def run_explain_analyze(
+    *,
+    db: Session,
+    sql: str,
+    timeout_ms: int | None = None
+) -> Dict[str, Any]:
+    timeout = int(timeout_ms or _settings.explain_analyze_timeout_ms)
+
+    savepoint = db.begin_nested()
+    try:
+        db.execute(text(f"SET LOCAL statement_timeout = {timeout}"))
+
+        result = db.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        ).fetchone()
+
+    except OperationalError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"EXPLAIN ANALYZE exceeded the {timeout} ms statement timeout"
+        )
+
+    finally:
+        savepoint.rollback()
+
+    if not result or not result[0]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="EXPLAIN ANALYZE returned no plan"
+        )
+
+    root = result[0][0]
+
+    nodes: List[Dict[str, Any]] = [
+        _analyzed_node(item["node"], item["depth"])
+        for item in walk_plan(root.get("Plan", {}))
+    ]
+
+    return {
+        "rolled_back": True,
+        "timeout_ms": timeout,
+        "planning_time_ms": root.get("Planning Time"),
+        "execution_time_ms": root.get("Execution Time"),
+        "nodes": nodes
+    }
+
+
+def _cost_nodes(root: Dict[str, Any]) -> List[Dict[str, Any]]:
+    root_cost = root.get("Total Cost") or 0
+    nodes: List[Dict[str, Any]] = []
+
+    for item in walk_plan(root):
+        node = item["node"]
+        total = node.get("Total Cost") or 0
+        children = sum(
+            (c.get("Total Cost") or 0) for c in node.get("Plans", []) or []
+        )
+        exclusive = max(total - children, 0)
+
+        nodes.append({
+            "depth": item["depth"],
+            "node_type": node.get("Node Type"),
+            "relation": node.get("Relation Name"),
+            "index": node.get("Index Name"),
+            "startup_cost": node.get("Startup Cost"),
+            "total_cost": total,
+            "exclusive_cost": round(exclusive, 2),
+            "cost_share": round(exclusive / root_cost, 4) if root_cost else None,
+            "plan_rows": node.get("Plan Rows"),
+            "plan_width": node.get("Plan Width"),
+            "sort_space_type": node.get("Sort Space Type"),
+            "outer_rows": (
+                (node.get("Plans") or [{}])[0].get("Plan Rows")
+                if node.get("Node Type") == "Nested Loop" else None
+            )
+        })
+
+    return nodes
+
+
+def _relation_sizes(db: Session, relations: List[str]) -> Dict[str, int]:
+    if not relations:
+        return {}
+
+    rows = db.execute(
+        text(
+            "SELECT relname, reltuples::bigint FROM pg_class "
+            "WHERE relkind = 'r' AND relname = ANY(:names)"
+        ),
+        {"names": relations}
+    ).fetchall()
+
+    return {r[0]: int(r[1]) for r in rows}
+
+
+def _work_mem_bytes(db: Session) -> int:
+    return int(
+        db.execute(
+            text("SELECT pg_size_bytes(current_setting('work_mem'))")
+        ).scalar()
+    )
+
+
+def _plan_warnings(db: Session, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    warnings: List[Dict[str, Any]] = []
+
+    seq_relations = sorted({
+        n["relation"] for n in nodes
+        if n["node_type"] == "Seq Scan" and n["relation"]
+    })
+    sizes = _relation_sizes(db, seq_relations)
+
+    sort_types = ("Sort", "Incremental Sort")
+    has_sort = any(n["node_type"] in sort_types for n in nodes)
+    work_mem = _work_mem_bytes(db) if has_sort else 0
+
+    for n in nodes:
+        if n["node_type"] == "Seq Scan" and sizes.get(n["relation"], 0) >= SEQ_SCAN_LARGE_ROWS:
+            warnings.append({
+                "type": "seq_scan_large_relation",
+                "relation": n["relation"],
+                "relation_rows": sizes[n["relation"]],
+                "message": f"Sequential scan on large relation {n['relation']}"
+            })
+
+        if n["node_type"] in sort_types:
+            estimated_bytes = (n["plan_rows"] or 0) * (n["plan_width"] or 0)
+
+            if n["sort_space_type"] == "Disk" or estimated_bytes > work_mem:
+                warnings.append({
+                    "type": "sort_spill",
+                    "estimated_bytes": estimated_bytes,
+                    "work_mem_bytes": work_mem,
+                    "message": "Sort is likely to spill to disk"
+                })
+
+        if n["node_type"] == "Nested Loop" and (
+            (n["plan_rows"] or 0) > NESTED_LOOP_MAX_ROWS
+            or (n["outer_rows"] or 0) > NESTED_LOOP_MAX_OUTER_ROWS
+        ):
+            warnings.append({
+                "type": "nested_loop_high_rows",
+                "plan_rows": n["plan_rows"],
+                "outer_rows": n["outer_rows"],
+                "message": "Nested loop over a high row estimate"
+            })
+
+    return warnings
+
+
+def analyze_plan_cost(*, db: Session, sql: str) -> Dict[str, Any]:
+    fingerprint = query_fingerprint(sql)
+
+    cached = plan_cache.get(fingerprint)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    result = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).fetchone()
+
+    if not result or not result[0]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unable to estimate query cost"
+        )
+
+    root = result[0][0].get("Plan", {})
+    nodes = _cost_nodes(root)
+
+    analysis = {
+        "fingerprint": fingerprint,
+        "startup_cost": root.get("Startup Cost"),
+        "total_cost": root.get("Total Cost"),
+        "plan_rows": root.get("Plan Rows"),
+        "nodes": nodes,
+        "warnings": _plan_warnings(db, nodes)
+    }
+
+    plan_cache.set(fingerprint, analysis)
+
+    return {**analysis, "cached": False}
@@ -1,22 +1,33 @@
 from typing import Dict, Any, List
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.db.session import get_db_session, engine
+from app.core.profiling import ProfiledRoute
 from app.mcp_server.auth import authenticate_jwt
 from app.mcp_server.audit import ensure_audit_table
+from app.mcp_server.etag import etag_response
 from app.mcp_server.tools.get_schema import get_schema
 from app.mcp_server.tools.get_user_permissions import get_user_permissions
 from app.mcp_server.tools.validate_query import validate_query
 from app.mcp_server.tools.dry_run_query import dry_run_query
 from app.mcp_server.tools.run_read_query import run_read_query
+from app.mcp_server.tools.stream_read_query import stream_read_query, STREAM_BATCH_SIZE_MAX
 from app.mcp_server.tools.run_write_query import run_write_query
+from app.mcp_server.tools.run_bulk_insert import run_bulk_insert
+from app.mcp_server.tools.run_write_transaction import run_write_transaction
+from app.mcp_server.tools.execute_write_safely import execute_write_safely
 from app.mcp_server.tools.explain_query import explain_query
 from app.mcp_server.tools.estimate_query_cost import estimate_query_cost
 from app.mcp_server.tools.audit_query_history import audit_query_history
+from app.mcp_server.tools.recommend_indexes import recommend_indexes
 
-mcp_router = APIRouter(tags=["mcp"])
+_settings = get_settings()
+
+mcp_router = APIRouter(tags=["mcp"], route_class=ProfiledRoute)
 
 ensure_audit_table(engine)
 
@@ -48,7 +59,7 @@ TOOLS_CATALOG: List[Dict[str, Any]] = [
         "description": "Perform a dry run of a SQL query without modifying data",
         "method": "POST",
         "path": "/mcp/tools/dry_run_query",
-        "arguments": {"sql": "string"},
+        "arguments": {"sql": "string", "analyze": "bool | optional"},
     },
     {
         "name": "run_read_query",
@@ -57,19 +68,54 @@ TOOLS_CATALOG: List[Dict[str, Any]] = [
         "path": "/mcp/tools/run_read_query",
         "arguments": {"sql": "string"},
     },
+    {
+        "name": "stream_read_query",
+        "description": "Execute a read-only SQL query and stream rows as NDJSON batches",
+        "method": "POST",
+        "path": "/mcp/tools/stream_read_query",
+        "arguments": {"sql": "string", "batch_size": "int | optional"},
+    },
     {
         "name": "run_write_query",
         "description": "Execute a write SQL query after validation and safety checks",
         "method": "POST",
         "path": "/mcp/tools/run_write_query",
-        "arguments": {"sql": "string"},
+        "arguments": {"sql": "string", "confirm": "bool | optional"},
+    },
+    {
+        "name": "run_bulk_insert",
+        "description": "Insert a batch of rows into one table in a single transaction",
+        "method": "POST",
+        "path": "/mcp/tools/run_bulk_insert",
+        "arguments": {
+            "table": "string",
+            "columns": "list[string]",
+            "rows": "list[list[any]]",
+        },
+    },
+    {
+        "name": "run_write_transaction",
+        "description": "Execute several write SQL statements atomically in one transaction",
+        "method": "POST",
+        "path": "/mcp/tools/run_write_transaction",
+        "arguments": {
+            "statements": "list[string]",
+            "confirm": "bool | optional",
+        },
+    },
+    {
+        "name": "execute_write_safely",
+        "description": "Validate, dry-run and execute a write SQL query in one call",
+        "method": "POST",
+        "path": "/mcp/tools/execute_write_safely",
+        "arguments": {"sql": "string", "confirm": "bool | optional"},
     },
     {
         "name": "explain_query",
         "description": "Return execution plan for a SQL query",
         "method": "POST",
         "path": "/mcp/tools/explain_query",
-        "arguments": {"sql": "string"},
+        "arguments": {"sql": "string", "analyze": "bool | optional"},
     },
     {
         "name": "estimate_query_cost",
@@ -88,6 +134,17 @@ TOOLS_CATALOG: List[Dict[str, Any]] = [
             "limit": "int | optional",
         },
     },
+    {
+        "name": "recommend_indexes",
+        "description": "Admin only: propose indexes for frequent query shapes in the audit log",
+        "method": "POST",
+        "path": "/mcp/tools/recommend_indexes",
+        "arguments": {
+            "sample_limit": "int | optional",
+            "top": "int | optional",
+            "scratch": "bool | optional",
+        },
+    },
 ]
 
 
@@ -95,6 +152,8 @@ def _get_db():
     try:
         with get_db_session() as db:
             yield db
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,6 +181,30 @@ def _get_current_user(
     return authenticate_jwt(token, db)
 
 
+def _flag(payload: Dict[str, Any], name: str) -> bool:
+    value = payload.get(name, False)
+
+    if not isinstance(value, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be a boolean",
+        )
+
+    return value
+
+
+def _integer(payload: Dict[str, Any], name: str, default: int) -> int:
+    value = payload.get(name, default)
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be an integer",
+        )
+
+    return value
+
+
 @mcp_router.get("/tools")
 def mcp_list_tools(
     user=Depends(_get_current_user),
@@ -133,18 +216,23 @@ def mcp_list_tools(
 
 @mcp_router.get("/tools/get_schema")
 def mcp_get_schema(
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(_get_db),
     user=Depends(_get_current_user),
 ):
-    return get_schema(db=db, engine=engine)
+    return etag_response(get_schema(db=db, engine=engine), if_none_match)
 
 
 @mcp_router.get("/tools/get_user_permissions")
 def mcp_get_user_permissions(
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(_get_db),
     user=Depends(_get_current_user),
 ):
-    return get_user_permissions(db=db, user_id=user.id)
+    return etag_response(
+        get_user_permissions(db=db, user_id=user.id),
+        if_none_match
+    )
 
 
 @mcp_router.post("/tools/validate_query")
@@ -186,6 +274,8 @@ def mcp_dry_run_query(
         engine=engine,
         user_id=user.id,
         sql=sql,
+        role=user.role,
+        analyze=_flag(payload, "analyze"),
     )
 
 
@@ -210,6 +300,39 @@ def mcp_run_read_query(
     )
 
 
+@mcp_router.post("/tools/stream_read_query")
+def mcp_stream_read_query(
+    payload: Dict[str, Any],
+    db: Session = Depends(_get_db),
+    user=Depends(_get_current_user),
+):
+    sql = payload.get("sql")
+    if not sql:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sql is required",
+        )
+
+    batch_size = payload.get("batch_size", _settings.stream_read_batch_size)
+    if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="batch_size must be a positive integer",
+        )
+
+    return StreamingResponse(
+        stream_read_query(
+            db=db,
+            engine=engine,
+            user_id=user.id,
+            sql=sql,
+            batch_size=min(batch_size, STREAM_BATCH_SIZE_MAX),
+            max_rows=_settings.stream_read_max_rows,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @mcp_router.post("/tools/run_write_query")
 def mcp_run_write_query(
     payload: Dict[str, Any],
@@ -228,6 +351,86 @@ def mcp_run_write_query(
         engine=engine,
         user_id=user.id,
         sql=sql,
+        role=user.role,
+        confirm=_flag(payload, "confirm"),
+    )
+
+
+@mcp_router.post("/tools/run_bulk_insert")
+def mcp_run_bulk_insert(
+    payload: Dict[str, Any],
+    db: Session = Depends(_get_db),
+    user=Depends(_get_current_user),
+):
+    table = payload.get("table")
+    columns = payload.get("columns")
+    rows = payload.get("rows")
+
+    if not table or not isinstance(table, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="table is required",
+        )
+
+    if not isinstance(columns, list) or not isinstance(rows, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="columns and rows must be lists",
+        )
+
+    return run_bulk_insert(
+        db=db,
+        engine=engine,
+        user_id=user.id,
+        table=table,
+        columns=columns,
+        rows=rows,
+    )
+
+
+@mcp_router.post("/tools/run_write_transaction")
+def mcp_run_write_transaction(
+    payload: Dict[str, Any],
+    db: Session = Depends(_get_db),
+    user=Depends(_get_current_user),
+):
+    statements = payload.get("statements")
+    if not statements or not isinstance(statements, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="statements must be a non-empty list",
+        )
+
+    return run_write_transaction(
+        db=db,
+        engine=engine,
+        user_id=user.id,
+        statements=statements,
+        role=user.role,
+        confirm=_flag(payload, "confirm"),
+    )
+
+
+@mcp_router.post("/tools/execute_write_safely")
+def mcp_execute_write_safely(
+    payload: Dict[str, Any],
+    db: Session = Depends(_get_db),
+    user=Depends(_get_current_user),
+):
+    sql = payload.get("sql")
+    if not sql:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sql is required",
+        )
+
+    return execute_write_safely(
+        db=db,
+        engine=engine,
+        user_id=user.id,
+        sql=sql,
+        role=user.role,
+        confirm=_flag(payload, "confirm"),
     )
 
 
@@ -249,6 +452,7 @@ def mcp_explain_query(
         engine=engine,
         user_id=user.id,
         sql=sql,
+        analyze=_flag(payload, "analyze"),
     )
 
 
@@ -292,3 +496,23 @@ def mcp_audit_query_history(
         limit=limit,
         offset=offset,
     )
+
+
+@mcp_router.post("/tools/recommend_indexes")
+def mcp_recommend_indexes(
+    payload: Dict[str, Any],
+    db: Session = Depends(_get_db),
+    user=Depends(_get_current_user),
+):
+    if user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+
+    return recommend_indexes(
+        db=db,
+        sample_limit=_integer(payload, "sample_limit", 2000),
+        top=_integer(payload, "top", 20),
+        scratch=_flag(payload, "scratch"),
+    )
@@ -7,7 +7,16 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
 from app.mcp_server.permissions import load_user_permissions
-from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.plans import run_explain_analyze
+from app.mcp_server.blast_radius import (
+    estimate_affected_rows,
+    check_row_ceiling,
+    row_ceiling_for_role
+)
+from app.mcp_server.validator import (
+    QueryValidationResult,
+    validate_query as core_validate_query
+)
 
 
 def _is_unique_violation(exc: Exception) -> bool:
@@ -27,12 +36,45 @@ def _is_unique_violation(exc: Exception) -> bool:
     return False
 
 
+def build_dry_run(
+    *,
+    db: Session,
+    sql: str,
+    validation: QueryValidationResult,
+    role: str | None = None,
+    analyze: bool = False
+) -> Dict[str, Any]:
+    plan = db.execute(text(f"EXPLAIN {sql}")).fetchall()
+
+    affected = estimate_affected_rows(
+        db=db,
+        sql=sql,
+        validation=validation
+    )
+
+    response = {
+        "operation": validation.operation,
+        "table": validation.table,
+        "plan": [str(r[0]) for r in plan],
+        "affected_rows": affected,
+        "row_ceiling": row_ceiling_for_role(role) if affected else None,
+        "ceiling_problem": check_row_ceiling(affected, role)
+    }
+
+    if analyze:
+        response["analyze"] = run_explain_analyze(db=db, sql=sql)
+
+    return response
+
+
 def dry_run_query(
     *,
     db: Session,
     engine: Engine,
     user_id: int,
-    sql: str
+    sql: str,
+    role: str | None = None,
+    analyze: bool = False
 ) -> Dict[str, Any]:
 
     try:
@@ -44,13 +86,13 @@ def dry_run_query(
             engine=engine
         )
 
-        plan = db.execute(text(f"EXPLAIN {sql}")).fetchall()
-
-        return {
-            "operation": validation.operation,
-            "table": validation.table,
-            "plan": [str(r[0]) for r in plan]
-        }
+        return build_dry_run(
+            db=db,
+            sql=sql,
+            validation=validation,
+            role=role,
+            analyze=analyze
+        )
 
     except IntegrityError as e:
         db.rollback()
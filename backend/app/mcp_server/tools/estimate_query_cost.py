@@ -3,10 +3,10 @@ from typing import Dict, Any
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
-from sqlalchemy import text
 
 from app.mcp_server.permissions import load_user_permissions
 from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.plans import analyze_plan_cost
 
 
 def estimate_query_cost(
@@ -31,25 +31,12 @@ def estimate_query_cost(
             engine=engine
         )
 
-        result = db.execute(
-            text(f"EXPLAIN (FORMAT JSON) {sql}")
-        ).fetchone()
-
-        if not result or not result[0]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unable to estimate query cost"
-            )
-
-        plan_root = result[0][0]
-        plan = plan_root.get("Plan", {})
+        analysis = analyze_plan_cost(db=db, sql=sql)
 
         return {
             "operation": validation.operation,
             "table": validation.table,
-            "startup_cost": plan.get("Startup Cost"),
-            "total_cost": plan.get("Total Cost"),
-            "plan_rows": plan.get("Plan Rows")
+            **analysis
         }
 
     except HTTPException:
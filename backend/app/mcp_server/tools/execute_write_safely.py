@@ -0,0 +1,83 @@
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.mcp_server.permissions import load_user_permissions
+from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.tools.validate_query import serialize_validation
+from app.mcp_server.tools.dry_run_query import build_dry_run
+from app.mcp_server.tools.run_write_query import execute_write
+
+
+def execute_write_safely(
+    *,
+    db: Session,
+    engine: Engine,
+    user_id: int,
+    sql: str,
+    role: str | None = None,
+    confirm: bool = False
+) -> Dict[str, Any]:
+
+    permissions = load_user_permissions(db, user_id)
+
+    validation = core_validate_query(
+        sql=sql,
+        permissions=permissions,
+        engine=engine
+    )
+
+    if validation.operation != "write":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not a write query"
+        )
+
+    problems: List[str] = []
+
+    try:
+        with db.begin_nested():
+            dry_run = build_dry_run(
+                db=db,
+                sql=sql,
+                validation=validation,
+                role=role
+            )
+
+        if dry_run["ceiling_problem"] and not confirm:
+            problems.append(dry_run["ceiling_problem"])
+
+    except Exception:
+        dry_run = {
+            "operation": validation.operation,
+            "table": validation.table,
+            "plan": []
+        }
+        problems.append("Dry run failed")
+
+    dry_run["problems"] = problems
+
+    if problems:
+        return {
+            "validation": serialize_validation(validation),
+            "dry_run": dry_run,
+            "write": None,
+            "executed": False
+        }
+
+    write = execute_write(
+        db=db,
+        engine=engine,
+        user_id=user_id,
+        sql=sql,
+        validation=validation
+    )
+
+    return {
+        "validation": serialize_validation(validation),
+        "dry_run": dry_run,
+        "write": write,
+        "executed": True
+    }
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.mcp_server.permissions import load_user_permissions
+from app.mcp_server.plans import run_explain_analyze
 from app.mcp_server.validator import validate_query as core_validate_query
 
 
@@ -14,7 +15,8 @@ def explain_query(
     db: Session,
     engine: Engine,
     user_id: int,
-    sql: str
+    sql: str,
+    analyze: bool = False
 ) -> Dict[str, Any]:
     try:
         permissions = load_user_permissions(db, user_id)
@@ -32,12 +34,17 @@ def explain_query(
         for r in rows:
             plan.append(str(r[0]))
 
-        return {
+        response = {
             "operation": validation.operation,
             "table": validation.table,
             "plan": plan
         }
 
+        if analyze:
+            response["analyze"] = run_explain_analyze(db=db, sql=sql)
+
+        return response
+
     except HTTPException:
         raise
     except Exception:
@@ -0,0 +1,56 @@
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.mcp_server.audit import fetch_audit_sql
+from app.mcp_server.index_advisor import recommend
+
+
+_settings = get_settings()
+
+
+def recommend_indexes(
+    *,
+    db: Session,
+    sample_limit: int = 2000,
+    top: int = 20,
+    scratch: bool = False
+) -> Dict[str, Any]:
+
+    if sample_limit <= 0 or sample_limit > 20000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sample_limit"
+        )
+
+    if top <= 0 or top > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid top"
+        )
+
+    try:
+        samples = fetch_audit_sql(
+            db=db,
+            operation="read",
+            status_filter="success",
+            limit=sample_limit
+        )
+
+        return recommend(
+            db=db,
+            samples=samples,
+            top=top,
+            scratch=scratch,
+            scratch_rows=_settings.index_advisor_scratch_rows
+        )
+
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Index recommendation failed"
+        )
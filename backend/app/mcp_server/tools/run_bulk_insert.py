@@ -0,0 +1,177 @@
+import time
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.models.user_permission import UserPermission
+from app.mcp_server.permissions import load_user_permissions, require_table_permission
+from app.mcp_server.executor import run_bulk_insert as execute_bulk_insert
+from app.mcp_server.audit import log_audit
+from app.mcp_server.tools.run_write_query import _is_unique_violation
+from app.utils.sql import normalize_identifier, normalize_identifiers, SQLUtilError
+
+
+BULK_INSERT_MAX_ROWS = 50000
+
+
+def _validate_bulk_request(
+    *,
+    engine: Engine,
+    permissions: Dict[str, UserPermission],
+    table: str,
+    columns: List[str],
+    rows: List[List[Any]]
+):
+    try:
+        table = normalize_identifier(table)
+        columns = normalize_identifiers(columns)
+    except SQLUtilError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if not columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="columns are required"
+        )
+
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="rows are required"
+        )
+
+    if len(rows) > BULK_INSERT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A single bulk insert is limited to {BULK_INSERT_MAX_ROWS} rows"
+        )
+
+    for row in rows:
+        if not isinstance(row, (list, tuple)) or len(row) != len(columns):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Every row must contain one value per column"
+            )
+
+    inspector = inspect(engine)
+
+    if not inspector.has_table(table):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Table does not exist"
+        )
+
+    existing = {c["name"].lower() for c in inspector.get_columns(table)}
+    if not set(columns).issubset(existing):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown column in bulk insert"
+        )
+
+    perm = require_table_permission(
+        permissions=permissions,
+        table_name=table,
+        operation="write"
+    )
+
+    if perm.allowed_columns is not None:
+        allowed = {c.lower() for c in perm.allowed_columns}
+
+        if not set(columns).issubset(allowed):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to perform this operation on the requested data."
+            )
+
+    return table, columns
+
+
+def run_bulk_insert(
+    *,
+    db: Session,
+    engine: Engine,
+    user_id: int,
+    table: str,
+    columns: List[str],
+    rows: List[List[Any]]
+) -> Dict[str, Any]:
+
+    permissions = load_user_permissions(db, user_id)
+
+    table, columns = _validate_bulk_request(
+        engine=engine,
+        permissions=permissions,
+        table=table,
+        columns=columns,
+        rows=rows
+    )
+
+    summary_sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ... -- bulk insert of {len(rows)} rows"
+    )
+
+    try:
+        started = time.perf_counter()
+
+        result = execute_bulk_insert(
+            db=db,
+            engine=engine,
+            table=table,
+            columns=columns,
+            rows=rows
+        )
+
+        elapsed = time.perf_counter() - started
+
+        log_audit(
+            db=db,
+            user_id=user_id,
+            operation="bulk_insert",
+            table_name=table,
+            sql_text=summary_sql,
+            status="success"
+        )
+
+        return {
+            "table": table,
+            "columns": columns,
+            "rows_inserted": result["rows_inserted"],
+            "batches": result["batches"],
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "rows_per_second": (
+                round(result["rows_inserted"] / elapsed, 2) if elapsed > 0 else None
+            )
+        }
+
+    except Exception as e:
+        db.rollback()
+
+        try:
+            log_audit(
+                db=db,
+                user_id=user_id,
+                operation="bulk_insert",
+                table_name=table,
+                sql_text=summary_sql,
+                status="failed"
+            )
+        except Exception:
+            pass
+
+        if _is_unique_violation(e.__cause__ or e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A record with the same unique value already exists."
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Bulk insert failed"
+        )
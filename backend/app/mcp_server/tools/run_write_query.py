@@ -5,9 +5,13 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app.mcp_server.permissions import load_user_permissions
-from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.validator import (
+    QueryValidationResult,
+    validate_query as core_validate_query
+)
 from app.mcp_server.executor import run_write
 from app.mcp_server.audit import log_audit
+from app.mcp_server.blast_radius import enforce_row_ceiling
 
 
 def _is_unique_violation(exc: Exception) -> bool:
@@ -27,28 +31,14 @@ def _is_unique_violation(exc: Exception) -> bool:
     return False
 
 
-def run_write_query(
+def execute_write(
     *,
     db: Session,
     engine: Engine,
     user_id: int,
-    sql: str
+    sql: str,
+    validation: QueryValidationResult
 ) -> Dict[str, Any]:
-
-    permissions = load_user_permissions(db, user_id)
-
-    validation = core_validate_query(
-        sql=sql,
-        permissions=permissions,
-        engine=engine
-    )
-
-    if validation.operation != "write":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Not a write query"
-        )
-
     try:
         result = run_write(
             db=db,
@@ -83,7 +73,7 @@ def run_write_query(
         except Exception:
             pass
 
-        if _is_unique_violation(e):
+        if _is_unique_violation(e.__cause__ or e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="A record with the same email already exists."
@@ -93,3 +83,44 @@ def run_write_query(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Write execution failed"
         )
+
+
+def run_write_query(
+    *,
+    db: Session,
+    engine: Engine,
+    user_id: int,
+    sql: str,
+    role: str | None = None,
+    confirm: bool = False
+) -> Dict[str, Any]:
+
+    permissions = load_user_permissions(db, user_id)
+
+    validation = core_validate_query(
+        sql=sql,
+        permissions=permissions,
+        engine=engine
+    )
+
+    if validation.operation != "write":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not a write query"
+        )
+
+    enforce_row_ceiling(
+        db=db,
+        sql=sql,
+        validation=validation,
+        role=role,
+        confirm=confirm
+    )
+
+    return execute_write(
+        db=db,
+        engine=engine,
+        user_id=user_id,
+        sql=sql,
+        validation=validation
+    )
@@ -0,0 +1,163 @@
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.mcp_server.permissions import load_user_permissions
+from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.executor import run_write
+from app.mcp_server.audit import log_audit
+from app.mcp_server.blast_radius import check_row_ceiling
+from app.mcp_server.tools.run_write_query import _is_unique_violation
+
+
+WRITE_TRANSACTION_MAX_STATEMENTS = 20
+
+
+class _RowCeilingExceeded(Exception):
+    pass
+
+
+def run_write_transaction(
+    *,
+    db: Session,
+    engine: Engine,
+    user_id: int,
+    statements: List[str],
+    role: str | None = None,
+    confirm: bool = False
+) -> Dict[str, Any]:
+
+    if not statements:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="statements are required"
+        )
+
+    if len(statements) > WRITE_TRANSACTION_MAX_STATEMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A transaction is limited to {WRITE_TRANSACTION_MAX_STATEMENTS} statements"
+        )
+
+    permissions = load_user_permissions(db, user_id)
+
+    validations = []
+    for position, sql in enumerate(statements, start=1):
+        if not isinstance(sql, str) or not sql.strip():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Statement {position}: sql is required"
+            )
+
+        try:
+            validation = core_validate_query(
+                sql=sql,
+                permissions=permissions,
+                engine=engine
+            )
+        except HTTPException as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Statement {position}: {e.detail}"
+            )
+
+        if validation.operation != "write":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Statement {position}: Not a write query"
+            )
+
+        validations.append(validation)
+
+    tables = list(dict.fromkeys(v.table for v in validations))
+    audit_table = ",".join(tables)[:128]
+    audit_sql = ";\n".join(s.strip().rstrip(";") for s in statements)
+
+    results: List[Dict[str, Any]] = []
+    position = 0
+
+    def log_failure():
+        try:
+            log_audit(
+                db=db,
+                user_id=user_id,
+                operation="transaction",
+                table_name=audit_table,
+                sql_text=audit_sql,
+                status="failed"
+            )
+        except Exception:
+            pass
+
+    try:
+        for position, (sql, validation) in enumerate(
+            zip(statements, validations), start=1
+        ):
+            result = run_write(
+                db=db,
+                engine=engine,
+                sql=sql,
+                validation=validation
+            )
+
+            # Checked against the real row count inside the transaction, so
+            # statements that depend on earlier ones are covered too.
+            if not confirm:
+                problem = check_row_ceiling({"rows": result["rows_affected"]}, role)
+                if problem:
+                    raise _RowCeilingExceeded(problem)
+
+            results.append({
+                "statement": position,
+                "table": validation.table,
+                **result
+            })
+
+    except _RowCeilingExceeded as e:
+        db.rollback()
+        log_failure()
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Statement {position}: {e}"
+        )
+
+    except Exception as e:
+        db.rollback()
+        log_failure()
+
+        if _is_unique_violation(e.__cause__ or e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Statement {position}: A record with the same unique value already exists."
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Write transaction failed at statement {position}"
+        )
+
+    try:
+        log_audit(
+            db=db,
+            user_id=user_id,
+            operation="transaction",
+            table_name=audit_table,
+            sql_text=audit_sql,
+            status="success"
+        )
+    except HTTPException:
+        # Writes are never committed without their audit record.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Write transaction rolled back: failed to write audit log"
+        )
+
+    return {
+        "statements": len(results),
+        "rows_affected": sum(r["rows_affected"] for r in results),
+        "results": results
+    }
@@ -0,0 +1,95 @@
+import json
+from typing import Iterator
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db_session
+from app.mcp_server.permissions import load_user_permissions
+from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.executor import stream_read
+from app.mcp_server.audit import log_audit
+
+
+STREAM_BATCH_SIZE_MAX = 5000
+
+
+def _line(payload) -> bytes:
+    return (json.dumps(jsonable_encoder(payload), separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _log(*, user_id: int, table_name: str, sql: str, status: str):
+    try:
+        with get_db_session() as db:
+            log_audit(
+                db=db,
+                user_id=user_id,
+                operation="read",
+                table_name=table_name,
+                sql_text=sql,
+                status=status
+            )
+    except Exception:
+        pass
+
+
+def stream_read_query(
+    *,
+    db: Session,
+    engine: Engine,
+    user_id: int,
+    sql: str,
+    batch_size: int,
+    max_rows: int
+) -> Iterator[bytes]:
+    try:
+        permissions = load_user_permissions(db, user_id)
+
+        validation = core_validate_query(
+            sql=sql,
+            permissions=permissions,
+            engine=engine
+        )
+
+    except HTTPException:
+        raise
+    except Exception:
+        _log(user_id=user_id, table_name="unknown", sql=sql, status="failed")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Read execution failed"
+        )
+
+    if validation.operation != "read":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not a read query"
+        )
+
+    # Validation happens before the first byte so permission errors still get
+    # a proper status code; failures after that are reported in-band.
+    def generate() -> Iterator[bytes]:
+        row_count = 0
+
+        try:
+            for batch in stream_read(
+                engine=engine,
+                validation=validation,
+                batch_size=batch_size,
+                max_rows=max_rows
+            ):
+                row_count += len(batch)
+                yield _line({"rows": batch})
+
+        except Exception:
+            _log(user_id=user_id, table_name=validation.table, sql=sql, status="failed")
+            yield _line({"error": "Read execution failed", "row_count": row_count})
+            return
+
+        _log(user_id=user_id, table_name=validation.table, sql=sql, status="success")
+        yield _line({"done": True, "row_count": row_count})
+
+    return generate()
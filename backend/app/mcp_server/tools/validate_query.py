@@ -5,7 +5,21 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app.mcp_server.permissions import load_user_permissions
-from app.mcp_server.validator import validate_query as core_validate_query
+from app.mcp_server.validator import (
+    QueryValidationResult,
+    validate_query as core_validate_query
+)
+
+
+def serialize_validation(result: QueryValidationResult) -> Dict[str, Any]:
+    return {
+        "operation": result.operation,
+        "table": result.table,
+        "columns": result.columns,
+        "limit": result.limit,
+        "returning": result.returning,
+        "upsert": result.upsert
+    }
 
 
 def validate_query(
@@ -24,12 +38,7 @@ def validate_query(
             engine=engine
         )
 
-        return {
-            "operation": result.operation,
-            "table": result.table,
-            "columns": result.columns,
-            "limit": result.limit
-        }
+        return serialize_validation(result)
 
     except HTTPException:
         raise
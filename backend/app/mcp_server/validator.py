@@ -20,12 +20,18 @@ class QueryValidationResult:
         columns: Optional[List[str]],
         limit: int,
         sql: str,
+        returning: Optional[List[str]] = None,
+        upsert: Optional[str] = None,
+        requested_limit: Optional[int] = None,
     ):
         self.operation = operation
         self.table = table
         self.columns = columns
         self.limit = limit
         self.sql = sql
+        self.returning = returning
+        self.upsert = upsert
+        self.requested_limit = requested_limit
 
 
 def _normalize_identifier(value: str) -> str:
@@ -114,6 +120,160 @@ def _extract_write_table(sql: str) -> Optional[str]:
     return None
 
 
+def _strip_literals(sql: str) -> str:
+    return re.sub(r"'(?:[^']|'')*'", "''", sql)
+
+
+def _parse_returning(sql: str) -> Optional[List[str]]:
+    stripped = _strip_literals(sql)
+
+    if not re.search(r"\breturning\b", stripped, re.IGNORECASE):
+        return None
+
+    match = re.search(
+        r"\breturning\s+(?P<cols>[\w\*,\s]+?)\s*;?\s*$",
+        stripped,
+        re.IGNORECASE,
+    )
+    if not match:
+        raise ValueError("Only plain column lists are supported in RETURNING")
+
+    cols_raw = match.group("cols").strip()
+    if cols_raw == "*":
+        return ["*"]
+
+    columns = [_normalize_identifier(c) for c in cols_raw.split(",")]
+    if not all(re.fullmatch(r"\w+", c) for c in columns):
+        raise ValueError("Only plain column lists are supported in RETURNING")
+
+    return columns
+
+
+def _validate_returning(
+    *,
+    sql: str,
+    table: str,
+    permissions: Dict[str, UserPermission],
+    inspector,
+) -> Optional[List[str]]:
+    returning = _parse_returning(sql)
+    if returning is None:
+        return None
+
+    perm = require_table_permission(
+        permissions=permissions,
+        table_name=table,
+        operation="read",
+    )
+
+    requested = None if returning == ["*"] else returning
+
+    if requested is not None:
+        existing = {c["name"].lower() for c in inspector.get_columns(table)}
+        if not set(requested).issubset(existing):
+            raise ValueError("Unknown column in RETURNING clause")
+
+        if perm.allowed_columns is not None:
+            allowed = {c.lower() for c in perm.allowed_columns}
+
+            if not set(requested).issubset(allowed):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You do not have permission to perform this operation on the requested data."
+                )
+
+    return filter_allowed_columns(requested, perm) or ["*"]
+
+
+def _split_top_level(text: str) -> List[str]:
+    parts: List[str] = []
+    depth = 0
+    current = ""
+
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+
+        if ch == "," and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+
+    parts.append(current)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_on_conflict(sql: str) -> Optional[Tuple[str, List[str], List[str]]]:
+    stripped = _strip_literals(sql)
+
+    if not re.search(r"\bon\s+conflict\b", stripped, re.IGNORECASE):
+        return None
+
+    match = re.search(
+        r"\bon\s+conflict\s*(?:\((?P<target>[^)]*)\))?\s*do\s+"
+        r"(?P<action>nothing|update\s+set\s+(?P<assignments>.+?))"
+        r"(?:\s+where\s+.+?)?"
+        r"(?:\s+returning\s+[\w\*,\s]+)?\s*;?\s*$",
+        stripped,
+        re.IGNORECASE | re.DOTALL,
+    )
+    if not match:
+        raise ValueError("Unsupported ON CONFLICT clause")
+
+    target_raw = match.group("target") or ""
+    target = [_normalize_identifier(c) for c in target_raw.split(",") if c.strip()]
+
+    if match.group("action").lower() == "nothing":
+        return "nothing", target, []
+
+    if not target:
+        raise ValueError("ON CONFLICT DO UPDATE requires a conflict target")
+
+    update_columns: List[str] = []
+    for assignment in _split_top_level(match.group("assignments")):
+        col = re.match(r"(\w+)\s*=", assignment)
+        if not col:
+            raise ValueError("Unsupported ON CONFLICT assignment")
+        update_columns.append(_normalize_identifier(col.group(1)))
+
+    return "update", target, update_columns
+
+
+def _validate_on_conflict(
+    *,
+    sql: str,
+    table: str,
+    perm: UserPermission,
+    inspector,
+) -> Optional[str]:
+    parsed = _parse_on_conflict(sql)
+    if parsed is None:
+        return None
+
+    if not sql.strip().lower().startswith("insert"):
+        raise ValueError("ON CONFLICT is only allowed on INSERT")
+
+    action, target, update_columns = parsed
+
+    existing = {c["name"].lower() for c in inspector.get_columns(table)}
+    if not set(target).issubset(existing) or not set(update_columns).issubset(existing):
+        raise ValueError("Unknown column in ON CONFLICT clause")
+
+    if perm.allowed_columns is not None:
+        allowed = {c.lower() for c in perm.allowed_columns}
+
+        if not set(update_columns).issubset(allowed):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to perform this operation on the requested data."
+            )
+
+    return action
+
+
 def validate_query(
     *,
     sql: str,
@@ -175,6 +335,7 @@ def validate_query(
                 columns=allowed_columns,
                 limit=enforced_limit,
                 sql=sql,
+                requested_limit=limit,
             )
 
        
@@ -184,7 +345,7 @@ def validate_query(
         if not table or not inspector.has_table(table):
             raise ValueError("Unable to determine target table")
 
-        require_table_permission(
+        write_perm = require_table_permission(
             permissions=permissions,
             table_name=table,
             operation="write",
@@ -198,12 +359,28 @@ def validate_query(
         if lowered.startswith("delete") and " where " not in lowered:
             raise ValueError("Unsafe delete without WHERE clause")
 
+        returning = _validate_returning(
+            sql=sql,
+            table=table,
+            permissions=permissions,
+            inspector=inspector,
+        )
+
+        upsert = _validate_on_conflict(
+            sql=sql,
+            table=table,
+            perm=write_perm,
+            inspector=inspector,
+        )
+
         return QueryValidationResult(
             operation="write",
             table=table,
             columns=None,
             limit=0,
             sql=sql,
+            returning=returning,
+            upsert=upsert,
         )
 
     except HTTPException:
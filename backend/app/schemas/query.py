@@ -10,7 +10,12 @@ class ValidationResponse(BaseModel):
     table: str
     columns: list[str] | None
     limit: int
+    returning: list[str] | None = None
+    upsert: str | None = None
 
 
 class WriteResultResponse(BaseModel):
     rows_affected: int
+    inserted: int | None = None
+    updated: int | None = None
+    rows: list[dict] | None = None
@@ -0,0 +1,302 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.jwt import create_access_token, decode_access_token
+from app.db.models.user_permission import UserPermission
+from app.mcp_server.audit import _format_audit_row
+from app.mcp_server.executor import _apply_read_limit, _rewrite_select_columns, run_read
+from app.mcp_server.permissions import filter_allowed_columns
+from app.mcp_server.validator import validate_query
+
+
+SQL_CORPUS = [
+    "SELECT id, full_name, email, city FROM candidates LIMIT 50",
+    "SELECT * FROM candidates WHERE LOWER(city) = LOWER('noida')",
+    "SELECT id, full_name, email FROM candidates WHERE LOWER(full_name) LIKE LOWER('%rahul%') LIMIT 20",
+    "SELECT id, full_name, email, city FROM candidates WHERE LOWER(full_name) LIKE LOWER('%raj%') OR LOWER(email) LIKE LOWER('%raj%') OR LOWER(city) LIKE LOWER('%raj%')",
+    "SELECT COUNT(*) FROM candidates WHERE LOWER(city) = LOWER('delhi')",
+    "SELECT id, candidate_id, interviewer_id, scheduled_at, status FROM interviews WHERE status = 'scheduled' ORDER BY scheduled_at DESC LIMIT 100",
+    "SELECT id, full_name, department FROM interviewers WHERE LOWER(department) = LOWER('engineering')",
+    "INSERT INTO candidates (full_name, email, city) VALUES ('Asha Rao', 'asha.rao@example.com', 'Pune')",
+    "INSERT INTO candidates (full_name, email, city) VALUES ('Asha Rao', 'asha.rao@example.com', 'Pune') RETURNING id, email",
+    "INSERT INTO candidates (full_name, email, city) VALUES ('Asha Rao', 'asha.rao@example.com', 'Pune') ON CONFLICT (email) DO UPDATE SET city = EXCLUDED.city RETURNING id",
+    "UPDATE interviews SET status = 'completed' WHERE id = 42",
+    "UPDATE candidates SET city = 'Noida' WHERE LOWER(email) = LOWER('candidate7@example.com') RETURNING id, city",
+    "DELETE FROM interviews WHERE id = 17",
+]
+
+SQLITE_SCHEMA = [
+    "CREATE TABLE candidates (id INTEGER PRIMARY KEY, full_name VARCHAR(255) NOT NULL, "
+    "email VARCHAR(255) NOT NULL UNIQUE, phone VARCHAR(32), city VARCHAR(128), created_at TIMESTAMP)",
+    "CREATE TABLE interviewers (id INTEGER PRIMARY KEY, full_name VARCHAR(255) NOT NULL, "
+    "email VARCHAR(255) NOT NULL UNIQUE, department VARCHAR(128), created_at TIMESTAMP)",
+    "CREATE TABLE interviews (id INTEGER PRIMARY KEY, candidate_id INTEGER NOT NULL, "
+    "interviewer_id INTEGER NOT NULL, scheduled_at TIMESTAMP NOT NULL, status VARCHAR(32) NOT NULL, "
+    "created_at TIMESTAMP)",
+]
+
+TABLES = ("candidates", "interviewers", "interviews")
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def _sqlite_engine() -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}
+    )
+
+    with engine.begin() as conn:
+        for ddl in SQLITE_SCHEMA:
+            conn.execute(text(ddl))
+
+    return engine
+
+
+def _permissions(restricted: bool) -> Dict[str, UserPermission]:
+    if not restricted:
+        return {
+            table: UserPermission(
+                user_id=1,
+                table_name=table,
+                can_read=True,
+                can_write=True,
+                allowed_columns=None
+            )
+            for table in TABLES
+        }
+
+    return {
+        "candidates": UserPermission(
+            user_id=2,
+            table_name="candidates",
+            can_read=True,
+            can_write=False,
+            allowed_columns=["id", "full_name", "email", "city"]
+        ),
+        "interviews": UserPermission(
+            user_id=2,
+            table_name="interviews",
+            can_read=True,
+            can_write=False,
+            allowed_columns=["id", "candidate_id", "interviewer_id", "scheduled_at", "status"]
+        ),
+    }
+
+
+def _audit_rows(count: int) -> List[Dict[str, Any]]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    return [
+        {
+            "id": i,
+            "user_id": i % 7 + 1,
+            "user_email": f"user{i % 7 + 1}@example.com",
+            "operation": "read",
+            "table_name": "candidates",
+            "sql_text": SQL_CORPUS[i % len(SQL_CORPUS)],
+            "status": "success",
+            "created_at": start + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def build_cases(engine: Engine, pg_engine: Optional[Engine]) -> Dict[str, Callable[[], Any]]:
+    admin = _permissions(restricted=False)
+    user = _permissions(restricted=True)
+
+    reads = [sql for sql in SQL_CORPUS if sql.lstrip().upper().startswith("SELECT")]
+    plain_reads = [sql for sql in reads if "COUNT(" not in sql.upper()]
+
+    for sql in SQL_CORPUS:
+        validate_query(sql=sql, permissions=admin, engine=engine)
+
+    token = create_access_token(subject=1, extra_claims={"role": "admin"})
+    audit_rows = _audit_rows(100)
+    user_perm = user["candidates"]
+
+    def validate_corpus(perms: Dict[str, UserPermission], corpus: List[str], target: Engine):
+        def run():
+            for sql in corpus:
+                validate_query(sql=sql, permissions=perms, engine=target)
+        return run
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "validator.validate_query[corpus,admin]": validate_corpus(admin, SQL_CORPUS, engine),
+        "validator.validate_query[reads,restricted]": validate_corpus(
+            user, [sql for sql in plain_reads if "interviewers" not in sql], engine
+        ),
+        "executor._rewrite_select_columns": lambda: [
+            _rewrite_select_columns(sql, ["id", "full_name", "email", "city"])
+            for sql in plain_reads
+        ],
+        "executor._apply_read_limit": lambda: [
+            _apply_read_limit(sql, 200) for sql in plain_reads
+        ],
+        "permissions.filter_allowed_columns[subset]": lambda: filter_allowed_columns(
+            ["id", "full_name", "email", "city", "phone"], user_perm
+        ),
+        "permissions.filter_allowed_columns[all]": lambda: filter_allowed_columns(
+            None, user_perm
+        ),
+        "jwt.create_access_token": lambda: create_access_token(
+            subject=1, extra_claims={"role": "admin"}
+        ),
+        "jwt.decode_access_token": lambda: decode_access_token(token),
+        "audit._format_audit_row[100]": lambda: [
+            _format_audit_row(row) for row in audit_rows
+        ],
+    }
+
+    if pg_engine is not None:
+        read_validation = validate_query(
+            sql=plain_reads[0], permissions=admin, engine=pg_engine
+        )
+
+        def pg_run_read():
+            with Session(pg_engine) as db:
+                run_read(db=db, engine=pg_engine, sql=plain_reads[0], validation=read_validation)
+
+        cases["validator.validate_query[corpus,postgres]"] = validate_corpus(
+            admin, SQL_CORPUS, pg_engine
+        )
+        cases["executor.run_read[postgres]"] = pg_run_read
+
+    return cases
+
+
+def measure(fn: Callable[[], Any], *, repeat: int, min_time: float) -> Dict[str, Any]:
+    timer = timeit.Timer(fn)
+
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    per_op_us = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(min(per_op_us), 3),
+        "median_us": round(statistics.median(per_op_us), 3),
+        "max_us": round(max(per_op_us), 3),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(args) -> int:
+    engine = _sqlite_engine()
+    pg_engine = create_engine(args.database_url) if args.database_url else None
+
+    cases = build_cases(engine, pg_engine)
+
+    results: Dict[str, Any] = {}
+    for name, fn in cases.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        results[name] = measure(fn, repeat=args.repeat, min_time=args.min_time)
+        print(f"{name:<48} {results[name]['median_us']:>12.2f} us/op")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgres": bool(pg_engine),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:<48} {'only in ' + ('current' if name in current else 'baseline'):>30}")
+            continue
+
+        old = baseline[name]["median_us"]
+        new = current[name]["median_us"]
+        change = (new - old) / old if old else 0.0
+
+        flag = ""
+        if change > args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "improved"
+
+        print(f"{name:<48} {old:>12.2f} {new:>12.2f} {change:>+8.1%}  {flag}")
+
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend hot-path microbenchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", help="Write results to this JSON file")
+    run_parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    run_parser.add_argument("--repeat", type=int, default=7)
+    run_parser.add_argument("--min-time", type=float, default=0.2)
+    run_parser.add_argument(
+        "--database-url",
+        help="Also run the Postgres-backed cases against this database"
+    )
+
+    compare_parser = sub.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        sys.exit(run(args))
+
+    sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import importlib.util
+import os
+
+import pytest
+
+# These tests TRUNCATE and reseed the database behind DATABASE_URL; only
+# point it at a scratch database.
+if not os.environ.get("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from app.db.seed_large import seed_large
+from app.db.session import engine, get_db_session
+from app.mcp_server.tools.estimate_query_cost import estimate_query_cost
+
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "alembic", "versions", "a41c7d2e9b10_add_case_insensitive_search_indexes.py"
+)
+
+CANDIDATES = 50_000
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("search_indexes_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _trgm_available() -> bool:
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )).first() is not None
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    seed_large(
+        candidates=CANDIDATES,
+        interviewers=10,
+        interviews=10,
+        users=2,
+        audit_logs=10,
+        admin_ratio=0.0,
+        city_skew=1.1,
+        status_mix={"scheduled": 1.0},
+        days_back=30,
+        days_ahead=30,
+        workers=2,
+        seed=42
+    )
+
+    migration = _load_migration()
+    trgm = _trgm_available()
+
+    with engine.connect() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            if trgm:
+                migration.upgrade()
+            else:
+                # Without pg_trgm only the lower() expression indexes can be built.
+                with migration.op.get_context().autocommit_block():
+                    for table, column in migration.SEARCH_COLUMNS:
+                        migration.op.create_index(
+                            f"ix_{table}_{column}_lower",
+                            table,
+                            [text(f"lower({column})")],
+                            if_not_exists=True
+                        )
+
+                migration.op.execute("ANALYZE candidates")
+
+        conn.commit()
+
+    return {"trgm": trgm}
+
+
+def _estimate(sql: str):
+    with get_db_session() as db:
+        return estimate_query_cost(db=db, engine=engine, user_id=1, sql=sql)
+
+
+def _assert_uses_index(result, index: str):
+    scans = [
+        n for n in result["nodes"]
+        if n["node_type"] in {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+    ]
+
+    assert index in {n["index"] for n in scans}, result["nodes"]
+    assert not [w for w in result["warnings"] if w["type"] == "seq_scan_large_relation"]
+
+
+def test_lower_equality_uses_expression_index(seeded):
+    result = _estimate(
+        "SELECT id, email FROM candidates "
+        "WHERE LOWER(email) = LOWER('Candidate4242@example.com')"
+    )
+
+    _assert_uses_index(result, "ix_candidates_email_lower")
+
+
+def test_substring_search_uses_trigram_index(seeded):
+    if not seeded["trgm"]:
+        pytest.skip("pg_trgm is not available")
+
+    result = _estimate(
+        "SELECT id, email FROM candidates "
+        "WHERE LOWER(email) LIKE LOWER('%ndidate4242@%')"
+    )
+
+    _assert_uses_index(result, "ix_candidates_email_trgm")
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from loadtest.mock_llm import DEFAULT_SCENARIOS, load_scenarios
+
+
+DEFAULT_CREDENTIALS = {
+    "admin": ("admin@example.com", "Admin@1234"),
+    "user": ("user@example.com", "User@1234"),
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[rank], 2)
+
+
+def parse_server_timing(header: str | None) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    timings[name] = float(value)
+                except ValueError:
+                    pass
+
+    return timings
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    stages: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    per_scenario: Dict[str, Dict[str, Any]] = {}
+
+    for sample in samples:
+        scenario = per_scenario.setdefault(
+            sample["scenario"], {"requests": 0, "errors": 0, "latency_ms": []}
+        )
+        scenario["requests"] += 1
+        scenario["latency_ms"].append(sample["latency_ms"])
+
+        if sample["error"]:
+            scenario["errors"] += 1
+            errors[sample["error"]] += 1
+            continue
+
+        stages["total"].append(sample["latency_ms"])
+        for stage, duration in sample["timings"].items():
+            stages[stage].append(duration)
+
+    total = len(samples)
+    failed = sum(errors.values())
+
+    return {
+        "requests": total,
+        "errors": failed,
+        "error_rate": round(failed / total, 4) if total else 0.0,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            stage: {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            for stage, values in stages.items()
+        },
+        "errors_by_type": dict(errors.most_common()),
+        "scenarios": {
+            name: {
+                "requests": data["requests"],
+                "errors": data["errors"],
+                "p50_ms": percentile(data["latency_ms"], 50),
+                "p95_ms": percentile(data["latency_ms"], 95),
+            }
+            for name, data in sorted(per_scenario.items())
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"\nrequests={report['requests']} errors={report['errors']} "
+        f"error_rate={report['error_rate']:.2%} "
+        f"throughput={report['throughput_rps']} req/s "
+        f"elapsed={report['elapsed_seconds']}s"
+    )
+
+    print(f"\n{'stage':<12}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES))
+    for stage, values in report["latency_ms"].items():
+        print(f"{stage:<12}" + "".join(f"{values[f'p{p}'] or 0:>10.1f}" for p in PERCENTILES))
+
+    print(f"\n{'scenario':<28}{'requests':>10}{'errors':>8}{'p50':>10}{'p95':>10}")
+    for name, data in report["scenarios"].items():
+        print(
+            f"{name:<28}{data['requests']:>10}{data['errors']:>8}"
+            f"{data['p50_ms'] or 0:>10.1f}{data['p95_ms'] or 0:>10.1f}"
+        )
+
+    if report["errors_by_type"]:
+        print("\nerrors:")
+        for error, count in report["errors_by_type"].items():
+            print(f"  {count:>6}  {error}")
+
+
+async def login(
+    client: httpx.AsyncClient,
+    backend_url: str,
+    email: str,
+    password: str
+) -> Dict[str, Any]:
+    resp = await client.post(
+        f"{backend_url}/auth/login",
+        json={"email": email, "password": password}
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    agent_url: str,
+    session: Dict[str, Any],
+    scenario: Dict[str, Any]
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    error = None
+    timings: Dict[str, float] = {}
+
+    try:
+        resp = await client.post(
+            f"{agent_url}/chat",
+            headers={"Authorization": f"Bearer {session['access_token']}"},
+            json={"user_id": session["id"], "message": scenario["message"]}
+        )
+
+        if resp.status_code >= 400:
+            try:
+                detail = resp.json().get("detail")
+            except Exception:
+                detail = resp.text
+            error = f"{resp.status_code}: {str(detail)[:120]}"
+        else:
+            timings = parse_server_timing(resp.headers.get("server-timing"))
+
+    except httpx.HTTPError as e:
+        error = f"{type(e).__name__}: {str(e)[:120]}"
+
+    return {
+        "scenario": scenario["name"],
+        "latency_ms": (time.perf_counter() - started) * 1000,
+        "timings": timings,
+        "error": error,
+    }
+
+
+async def run_load(
+    *,
+    agent_url: str,
+    backend_url: str,
+    scenarios: List[Dict[str, Any]],
+    concurrency: int,
+    duration: float | None,
+    requests: int | None,
+    credentials: Dict[str, tuple[str, str]] = DEFAULT_CREDENTIALS,
+    timeout: float = 60.0,
+    seed: int | None = None
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        sessions = {
+            role: await login(client, backend_url, email, password)
+            for role, (email, password) in credentials.items()
+        }
+
+        runnable = [s for s in scenarios if s.get("role", "user") in sessions]
+        if not runnable:
+            raise RuntimeError("No scenarios match the available credentials")
+
+        weights = [s.get("weight", 1) for s in runnable]
+
+        samples: List[Dict[str, Any]] = []
+        remaining = requests
+        deadline = time.perf_counter() + duration if duration else None
+
+        def take() -> bool:
+            nonlocal remaining
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if remaining is not None:
+                if remaining <= 0:
+                    return False
+                remaining -= 1
+            return True
+
+        async def worker():
+            while take():
+                scenario = rng.choices(runnable, weights=weights)[0]
+                session = sessions[scenario.get("role", "user")]
+                samples.append(await _send(client, agent_url, session, scenario))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a chat mix against the agent")
+    parser.add_argument("--agent-url", default="http://127.0.0.1:18001")
+    parser.add_argument("--backend-url", default="http://127.0.0.1:18000")
+    parser.add_argument("--scenarios", default=str(DEFAULT_SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load(
+            agent_url=args.agent_url.rstrip("/"),
+            backend_url=args.backend_url.rstrip("/"),
+            scenarios=load_scenarios(args.scenarios),
+            concurrency=args.concurrency,
+            duration=None if args.requests else args.duration,
+            requests=args.requests,
+            seed=args.seed
+        )
+    )
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
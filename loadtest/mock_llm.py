@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+DEFAULT_SCENARIOS = Path(__file__).resolve().parent / "scenarios.json"
+
+VAGUE_PLAN = {"intent": "vague", "actions": []}
+
+_USER_MESSAGE = re.compile(r"User message:\s*\n(?P<message>.*)\Z", re.DOTALL)
+
+# Mirrors provider prefix caching: prompts of at least 1024 tokens are cached
+# in 128-token increments of their shared prefix.
+CACHE_MIN_CHARS = 1024 * 4
+CACHE_BLOCK_CHARS = 128 * 4
+
+
+def load_scenarios(path: str | Path) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _extract_message(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") != "user":
+            continue
+
+        content = message.get("content") or ""
+        match = _USER_MESSAGE.search(content)
+
+        return (match.group("message") if match else content).strip()
+
+    return ""
+
+
+def _cached_prefix_chars(prompt: str, seen: Set[str]) -> int:
+    if len(prompt) < CACHE_MIN_CHARS:
+        return 0
+
+    cached = 0
+    for end in range(CACHE_BLOCK_CHARS, len(prompt) + 1, CACHE_BLOCK_CHARS):
+        digest = hashlib.sha256(prompt[:end].encode("utf-8")).hexdigest()
+
+        if digest in seen and cached == end - CACHE_BLOCK_CHARS:
+            cached = end
+
+        seen.add(digest)
+
+    return cached if cached >= CACHE_MIN_CHARS else 0
+
+
+def _completion(
+    model: str,
+    content: str,
+    prompt_chars: int,
+    cached_chars: int
+) -> Dict[str, Any]:
+    prompt_tokens = prompt_chars // 4
+    cached_tokens = cached_chars // 4
+    completion_tokens = len(content) // 4
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+    }
+
+
+def create_app(
+    *,
+    scenarios: List[Dict[str, Any]],
+    latency_ms: float,
+    jitter_ms: float,
+    failure_rate: float,
+    seed: int | None = None
+) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI-compatible planner")
+
+    plans = {s["message"].strip().lower(): s["plan"] for s in scenarios}
+    rng = random.Random(seed)
+    stats = {
+        "requests": 0,
+        "failures": 0,
+        "unmatched": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "models": {},
+    }
+    seen_prefixes: Set[str] = set()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+
+        delay = max(0.0, rng.gauss(latency_ms, jitter_ms)) if jitter_ms else latency_ms
+        await asyncio.sleep(delay / 1000)
+
+        if rng.random() < failure_rate:
+            stats["failures"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Injected failure", "type": "server_error"}}
+            )
+
+        model = body.get("model", "mock")
+        stats["models"][model] = stats["models"].get(model, 0) + 1
+
+        messages = body.get("messages") or []
+        message = _extract_message(messages)
+
+        plan = plans.get(message.lower())
+        if plan is None:
+            stats["unmatched"] += 1
+            plan = VAGUE_PLAN
+
+        prompt = "".join(m.get("content") or "" for m in messages)
+        cached_chars = _cached_prefix_chars(prompt, seen_prefixes)
+
+        stats["prompt_tokens"] += len(prompt) // 4
+        stats["cached_tokens"] += cached_chars // 4
+
+        return _completion(
+            model,
+            json.dumps(plan),
+            len(prompt),
+            cached_chars
+        )
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OpenAI-compatible server that returns canned planner output"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18002)
+    parser.add_argument("--scenarios", default=str(DEFAULT_SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(
+        scenarios=load_scenarios(args.scenarios),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed
+    )
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from loadtest.driver import PERCENTILES, percentile
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+
+DEFAULT_THRESHOLD = 0.20
+MAX_LISTED_DIFFS = 20
+
+
+def _backend_helpers(database_url: str, jwt_secret: str):
+    os.environ.setdefault("DATABASE_URL", database_url)
+    os.environ.setdefault("JWT_SECRET_KEY", jwt_secret)
+
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+    from app.core.jwt import create_access_token
+    from app.mcp_server.index_advisor import query_shape
+
+    return create_access_token, query_shape
+
+
+def load_window(
+    *,
+    database_url: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int
+) -> tuple[List[Dict[str, Any]], Dict[int, str]]:
+    engine = create_engine(database_url)
+
+    clauses = []
+    params: Dict[str, Any] = {"limit": limit}
+
+    if since:
+        clauses.append("a.created_at >= :since")
+        params["since"] = since
+
+    if until:
+        clauses.append("a.created_at < :until")
+        params["until"] = until
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT a.id, a.user_id, a.operation, a.table_name, a.sql_text, "
+                    "a.status, a.created_at, u.role "
+                    "FROM mcp_audit_logs a LEFT JOIN users u ON u.id = a.user_id "
+                    f"{where} ORDER BY a.created_at, a.id LIMIT :limit"
+                ),
+                params
+            ).mappings().all()
+    finally:
+        engine.dispose()
+
+    events = [dict(r) for r in rows]
+    roles = {e["user_id"]: e["role"] for e in events if e["role"]}
+
+    return events, roles
+
+
+def _request_for(event: Dict[str, Any], execute_writes: bool) -> Optional[tuple[str, Dict[str, Any]]]:
+    operation = event["operation"]
+    sql = event["sql_text"]
+
+    if operation == "read":
+        return "run_read_query", {"sql": sql}
+
+    if operation == "write":
+        if execute_writes:
+            return "run_write_query", {"sql": sql, "confirm": True}
+        return "dry_run_query", {"sql": sql}
+
+    if operation == "transaction" and execute_writes:
+        return "run_write_transaction", {
+            "statements": [s for s in sql.split(";\n") if s.strip()],
+            "confirm": True
+        }
+
+    return None
+
+
+async def replay(
+    *,
+    target_url: str,
+    events: List[Dict[str, Any]],
+    tokens: Dict[int, str],
+    speed: float,
+    max_in_flight: int,
+    execute_writes: bool,
+    timeout: float
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    limits = httpx.Limits(
+        max_connections=max_in_flight,
+        max_keepalive_connections=max_in_flight
+    )
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def issue(event: Dict[str, Any], tool: str, body: Dict[str, Any]):
+            async with semaphore:
+                started = time.perf_counter()
+                detail = None
+
+                try:
+                    resp = await client.post(
+                        f"{target_url}/mcp/tools/{tool}",
+                        headers={"Authorization": f"Bearer {tokens[event['user_id']]}"},
+                        json=body
+                    )
+                    status_code = resp.status_code
+
+                    if status_code >= 400:
+                        try:
+                            detail = resp.json().get("detail")
+                        except Exception:
+                            detail = resp.text
+
+                except httpx.HTTPError as e:
+                    status_code = 0
+                    detail = f"{type(e).__name__}: {e}"
+
+                results.append({
+                    "audit_id": event["id"],
+                    "user_id": event["user_id"],
+                    "tool": tool,
+                    "sql": event["sql_text"],
+                    "recorded_status": event["status"],
+                    "status": "success" if 0 < status_code < 400 else "failed",
+                    "status_code": status_code,
+                    "detail": str(detail)[:200] if detail else None,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                })
+
+        tasks = []
+        first_at = events[0]["created_at"] if events else None
+        started = time.perf_counter()
+
+        for event in events:
+            request = _request_for(event, execute_writes)
+
+            if request is None or event["user_id"] not in tokens:
+                results.append({
+                    "audit_id": event["id"],
+                    "skipped": True,
+                    "reason": "unsupported operation" if request is None else "unknown user",
+                    "operation": event["operation"],
+                })
+                continue
+
+            if speed > 0:
+                offset = (event["created_at"] - first_at).total_seconds() / speed
+                delay = offset - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            tasks.append(asyncio.create_task(issue(event, *request)))
+
+        await asyncio.gather(*tasks)
+
+    return results
+
+
+def build_report(
+    results: List[Dict[str, Any]],
+    *,
+    query_shape,
+    elapsed: float,
+    baseline: Optional[Dict[str, Any]],
+    threshold: float
+) -> Dict[str, Any]:
+    issued = [r for r in results if not r.get("skipped")]
+    skipped = Counter(r["reason"] for r in results if r.get("skipped"))
+
+    outcome = Counter()
+    regressions: List[Dict[str, Any]] = []
+    fixed: List[Dict[str, Any]] = []
+
+    for r in issued:
+        outcome[(r["recorded_status"], r["status"])] += 1
+
+        if r["recorded_status"] == "success" and r["status"] == "failed":
+            regressions.append(r)
+        elif r["recorded_status"] == "failed" and r["status"] == "success":
+            fixed.append(r)
+
+    shapes: Dict[str, List[float]] = defaultdict(list)
+    for r in issued:
+        if r["status"] == "success":
+            shapes[query_shape(r["sql"])].append(r["latency_ms"])
+
+    latencies = [r["latency_ms"] for r in issued if r["status"] == "success"]
+
+    report: Dict[str, Any] = {
+        "events": len(results),
+        "issued": len(issued),
+        "skipped": dict(skipped),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(issued) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {f"p{p}": percentile(latencies, p) for p in PERCENTILES},
+        "status_matrix": {
+            f"{recorded}->{replayed}": count
+            for (recorded, replayed), count in sorted(outcome.items())
+        },
+        "newly_failing": [
+            {k: r[k] for k in ("audit_id", "user_id", "tool", "status_code", "detail", "sql")}
+            for r in regressions[:MAX_LISTED_DIFFS]
+        ],
+        "newly_succeeding": [
+            {k: r[k] for k in ("audit_id", "user_id", "tool", "sql")}
+            for r in fixed[:MAX_LISTED_DIFFS]
+        ],
+        "shapes": {
+            shape: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+            }
+            for shape, values in sorted(shapes.items(), key=lambda kv: -len(kv[1]))
+        },
+    }
+
+    if baseline:
+        report["baseline_comparison"] = compare_to_baseline(report, baseline, threshold)
+
+    return report
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float
+) -> Dict[str, Any]:
+    def change(old, new):
+        if not old or new is None:
+            return None
+        return round((new - old) / old, 4)
+
+    overall = {
+        p: {
+            "baseline": baseline["latency_ms"].get(p),
+            "current": report["latency_ms"].get(p),
+            "change": change(baseline["latency_ms"].get(p), report["latency_ms"].get(p)),
+        }
+        for p in report["latency_ms"]
+    }
+
+    slower, faster = [], []
+
+    for shape, current in report["shapes"].items():
+        previous = baseline.get("shapes", {}).get(shape)
+        if not previous:
+            continue
+
+        delta = change(previous["p50_ms"], current["p50_ms"])
+        if delta is None:
+            continue
+
+        entry = {
+            "shape": shape,
+            "baseline_p50_ms": previous["p50_ms"],
+            "current_p50_ms": current["p50_ms"],
+            "change": delta,
+        }
+
+        if delta > threshold:
+            slower.append(entry)
+        elif delta < -threshold:
+            faster.append(entry)
+
+    return {
+        "threshold": threshold,
+        "latency": overall,
+        "error_rate": {
+            "baseline": _failure_rate(baseline),
+            "current": _failure_rate(report),
+        },
+        "slower_shapes": sorted(slower, key=lambda e: -e["change"]),
+        "faster_shapes": sorted(faster, key=lambda e: e["change"]),
+    }
+
+
+def _failure_rate(report: Dict[str, Any]) -> float:
+    failed = sum(
+        count for key, count in report["status_matrix"].items()
+        if key.endswith("->failed")
+    )
+    return round(failed / report["issued"], 4) if report["issued"] else 0.0
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"\nevents={report['events']} issued={report['issued']} "
+        f"skipped={report['skipped']} throughput={report['throughput_rps']} req/s"
+    )
+    print("latency: " + ", ".join(f"{k}={v}" for k, v in report["latency_ms"].items()))
+    print("recorded->replayed: " + ", ".join(
+        f"{k}={v}" for k, v in report["status_matrix"].items()
+    ))
+
+    for r in report["newly_failing"]:
+        print(f"  newly failing #{r['audit_id']} ({r['status_code']}): {r['detail']}")
+
+    comparison = report.get("baseline_comparison")
+    if not comparison:
+        return
+
+    print("\nvs baseline:")
+    for p, values in comparison["latency"].items():
+        print(f"  {p}: {values['baseline']} -> {values['current']} ({values['change']})")
+    print(
+        f"  error rate: {comparison['error_rate']['baseline']} -> "
+        f"{comparison['error_rate']['current']}"
+    )
+    for entry in comparison["slower_shapes"][:MAX_LISTED_DIFFS]:
+        print(f"  SLOWER {entry['change']:+.1%}  {entry['shape'][:100]}")
+    for entry in comparison["faster_shapes"][:MAX_LISTED_DIFFS]:
+        print(f"  faster {entry['change']:+.1%}  {entry['shape'][:100]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a window of mcp_audit_logs against an MCP server"
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        help="Database holding the audit log to replay (defaults to $DATABASE_URL)"
+    )
+    parser.add_argument(
+        "--jwt-secret",
+        default=os.environ.get("JWT_SECRET_KEY"),
+        help="JWT secret of the target server, used to mint per-user tokens"
+    )
+    parser.add_argument("--target-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--limit", type=int, default=10_000)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Inter-arrival scale: 2 replays twice as fast, 0 sends as fast as possible"
+    )
+    parser.add_argument("--max-in-flight", type=int, default=50)
+    parser.add_argument(
+        "--execute-writes",
+        action="store_true",
+        help="Execute recorded writes instead of dry-running them"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--baseline", help="Previous replay report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.jwt_secret:
+        parser.error("--database-url and --jwt-secret (or their env vars) are required")
+
+    create_access_token, query_shape = _backend_helpers(args.database_url, args.jwt_secret)
+
+    events, roles = load_window(
+        database_url=args.database_url,
+        since=args.since,
+        until=args.until,
+        limit=args.limit
+    )
+
+    if not events:
+        print("No audit rows in the requested window")
+        return
+
+    tokens = {
+        user_id: create_access_token(subject=user_id, extra_claims={"role": role})
+        for user_id, role in roles.items()
+    }
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        replay(
+            target_url=args.target_url.rstrip("/"),
+            events=events,
+            tokens=tokens,
+            speed=args.speed,
+            max_in_flight=args.max_in_flight,
+            execute_writes=args.execute_writes,
+            timeout=args.timeout
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = build_report(
+        results,
+        query_shape=query_shape,
+        elapsed=elapsed,
+        baseline=baseline,
+        threshold=args.threshold
+    )
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from loadtest.driver import print_report, run_load
+from loadtest.mock_llm import DEFAULT_SCENARIOS, load_scenarios
+
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+AGENT_DIR = ROOT / "agent"
+
+READY_TIMEOUT_SECONDS = 60
+
+
+def _spawn(args: List[str], *, cwd: Path, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=cwd,
+        env={**os.environ, **env}
+    )
+
+
+def _wait_ready(url: str, process: subprocess.Popen, name: str):
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with code {process.returncode}")
+
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+
+        time.sleep(0.25)
+
+    raise RuntimeError(f"{name} did not become ready at {url}")
+
+
+def _uvicorn(app: str, port: int, workers: int) -> List[str]:
+    return [
+        "-m", "uvicorn", app,
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Start the backend, agent and mock LLM locally and run a load test"
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        help="Local, already migrated Postgres database (defaults to $DATABASE_URL)"
+    )
+    parser.add_argument(
+        "--jwt-secret",
+        default=os.environ.get("JWT_SECRET_KEY", "loadtest-secret-key-0123456789abcdef")
+    )
+    parser.add_argument("--seed-data", choices=["none", "small", "large"], default="small")
+    parser.add_argument("--backend-port", type=int, default=18000)
+    parser.add_argument("--agent-port", type=int, default=18001)
+    parser.add_argument("--mock-port", type=int, default=18002)
+    parser.add_argument("--backend-workers", type=int, default=1)
+    parser.add_argument("--agent-workers", type=int, default=1)
+    parser.add_argument("--scenarios", default=str(DEFAULT_SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    backend_env = {
+        "DATABASE_URL": args.database_url,
+        "JWT_SECRET_KEY": args.jwt_secret,
+    }
+
+    if args.seed_data != "none":
+        module = "app.db.seed" if args.seed_data == "small" else "app.db.seed_large"
+        subprocess.run(
+            [sys.executable, "-m", module],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **backend_env},
+            check=True
+        )
+
+    memory_dir = tempfile.mkdtemp(prefix="loadtest-")
+
+    processes: Dict[str, subprocess.Popen] = {}
+
+    try:
+        processes["mock_llm"] = _spawn(
+            [
+                "-m", "loadtest.mock_llm",
+                "--port", str(args.mock_port),
+                "--scenarios", args.scenarios,
+                "--latency-ms", str(args.latency_ms),
+                "--jitter-ms", str(args.jitter_ms),
+                "--failure-rate", str(args.failure_rate),
+            ],
+            cwd=ROOT,
+            env={}
+        )
+        processes["backend"] = _spawn(
+            _uvicorn("app.main:app", args.backend_port, args.backend_workers),
+            cwd=BACKEND_DIR,
+            env=backend_env
+        )
+        processes["agent"] = _spawn(
+            _uvicorn("app.main:app", args.agent_port, args.agent_workers),
+            cwd=AGENT_DIR,
+            env={
+                "MCP_BASE_URL": f"http://127.0.0.1:{args.backend_port}",
+                "OPENAI_API_KEY": "loadtest",
+                "OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/v1",
+                "memory_store_path": os.path.join(memory_dir, "memory_store.json"),
+                "memory_sqlite_path": os.path.join(memory_dir, "memory_store.db"),
+            }
+        )
+
+        _wait_ready(f"http://127.0.0.1:{args.mock_port}/stats", processes["mock_llm"], "mock_llm")
+        _wait_ready(f"http://127.0.0.1:{args.backend_port}/openapi.json", processes["backend"], "backend")
+        _wait_ready(f"http://127.0.0.1:{args.agent_port}/openapi.json", processes["agent"], "agent")
+
+        report = asyncio.run(
+            run_load(
+                agent_url=f"http://127.0.0.1:{args.agent_port}",
+                backend_url=f"http://127.0.0.1:{args.backend_port}",
+                scenarios=load_scenarios(args.scenarios),
+                concurrency=args.concurrency,
+                duration=None if args.requests else args.duration,
+                requests=args.requests,
+                seed=args.seed
+            )
+        )
+
+        report["mock_llm"] = httpx.get(
+            f"http://127.0.0.1:{args.mock_port}/stats", timeout=5
+        ).json()
+        report["config"] = {
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "failure_rate": args.failure_rate,
+            "backend_workers": args.backend_workers,
+            "agent_workers": args.agent_workers,
+            "seed_data": args.seed_data,
+        }
+
+        print_report(report)
+        print(f"\nmock_llm: {report['mock_llm']}")
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+
+    finally:
+        for process in processes.values():
+            process.terminate()
+
+        for process in processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()